@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Shared, TTL-bound holder for the latest analysis.
+
+    Readers never wait on a refresh once a first analysis exists: a stale entry
+    is served as-is while a background thread recomputes it
+    (stale-while-revalidate). A failed or empty refresh keeps the previous
+    analysis. ``start_worker`` additionally refreshes on a fixed interval.
+    An optional ``summarize`` callable derives a summary, e.g. chart rollups,
+    once per refresh instead of once per read.
+    """
+
+    def __init__(self, loader: Callable[[], Dict], ttl: float = 30 * 60,
+                 summarize: Optional[Callable[[Dict], Any]] = None):
+        self.loader = loader
+        self.ttl = ttl
+        self.summarize = summarize
+
+        self._analysis: Optional[Dict] = None
+        self._summary: Any = None
+        self._refreshed_at: Optional[datetime] = None
+        self._refreshed_monotonic = 0.0
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def refreshed_at(self) -> Optional[datetime]:
+        """Wall-clock time of the last successful refresh"""
+        return self._refreshed_at
+
+    def is_stale(self) -> bool:
+        """Return True if there is no analysis yet or it is older than the TTL"""
+        return self._analysis is None or time.monotonic() - self._refreshed_monotonic >= self.ttl
+
+    def get(self) -> Tuple[Dict, Optional[datetime]]:
+        """Return the cached analysis and its refresh time.
+
+        Only the very first call blocks on the loader; later stale reads
+        trigger a background refresh and return the previous analysis.
+        """
+        analysis, _, refreshed_at = self.get_with_summary()
+        return analysis, refreshed_at
+
+    def get_with_summary(self) -> Tuple[Dict, Any, Optional[datetime]]:
+        """Like ``get``, also returning the summary computed for the same analysis"""
+        if self._analysis is None:
+            self.refresh()
+        elif self.is_stale():
+            self.refresh_in_background()
+        with self._lock:
+            return self._analysis or {}, self._summary, self._refreshed_at
+
+    @property
+    def has_analysis(self) -> bool:
+        """Return True once any refresh has produced data"""
+        return self._analysis is not None
+
+    @property
+    def refreshing(self) -> bool:
+        """Return True while a refresh or stream is in progress"""
+        return self._refresh_lock.locked()
+
+    def refresh(self):
+        """Run the loader now and store its result if it produced any data"""
+        requested = time.monotonic()
+        with self._refresh_lock:
+            # A refresh or stream that finished while this call waited already
+            # stored an analysis at least as new as this one would be
+            if self._analysis is not None and self._refreshed_monotonic >= requested:
+                return
+            try:
+                analysis = self.loader()
+            except Exception as e:
+                logger.warning("Error refreshing analysis: %s", e)
+                analysis = None
+            self._store(analysis)
+
+    def stream(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        """Pass streamed articles through, caching them grouped by risk level once the stream ends.
+
+        Used instead of ``refresh`` when a reader wants to show results as
+        they arrive. An abandoned stream stores nothing.
+        """
+        analysis = {}
+        with self._refresh_lock:
+            for article in articles:
+                analysis.setdefault(article['risk_assessment']['level'], []).append(article)
+                yield article
+            self._store(analysis)
+
+    def _store(self, analysis: Optional[Dict]):
+        if analysis:
+            summary = None
+            if self.summarize:
+                try:
+                    summary = self.summarize(analysis)
+                except Exception as e:
+                    logger.warning("Error summarizing analysis: %s", e)
+            with self._lock:
+                self._analysis = analysis
+                self._summary = summary
+                self._refreshed_at = datetime.now()
+                self._refreshed_monotonic = time.monotonic()
+
+    def refresh_in_background(self):
+        """Start a background refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='analysis-refresh', daemon=True).start()
+
+    def start_worker(self, interval: Optional[float] = None):
+        """Refresh periodically in a daemon thread until stop_worker is called"""
+        interval = interval or self.ttl
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            # Each worker gets its own stop event so a restart never revives a stopped one
+            stop = self._stop = threading.Event()
+
+            def run():
+                while not stop.wait(interval):
+                    self.refresh()
+
+            self._worker = threading.Thread(target=run, name='analysis-worker', daemon=True)
+            self._worker.start()
+
+    def stop_worker(self):
+        """Stop the periodic refresh worker"""
+        self._stop.set()
+        with self._lock:
+            self._worker = None
+
+    @property
+    def worker_running(self) -> bool:
+        """Return True while the periodic refresh worker is active"""
+        return self._worker is not None and self._worker.is_alive()
@@ -0,0 +1,248 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Bodies smaller than this are sent uncompressed; gzip would barely shrink them
+GZIP_MIN_BYTES = 1024
+
+SORT_ORDERS = ('id', 'date', 'score', 'confidence')
+_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+
+class BadRequest(ValueError):
+    """A query parameter is missing or malformed"""
+
+
+class AnalysisAPI:
+    """Read-only JSON API over a ResultStore, independent of the HTTP server around it.
+
+    Endpoints:
+
+    * ``/articles``: filtered, paginated articles. Filters are ``risk_level``
+      and ``sector`` (repeatable or comma-separated), ``impact_area``,
+      ``impact_level`` and an ISO ``since``/``until`` date range. ``sort`` is
+      one of id, date, score or confidence; ``limit`` and ``offset`` page.
+    * ``/summary``: the dashboard rollups over the whole corpus.
+    * ``/health``: the corpus version and article count.
+
+    Responses are cached in memory, keyed on the request and the store's
+    corpus version, so repeated requests between ingestion runs never touch
+    SQLite beyond reading the version. ETags derive from the same key:
+    a client revalidating with If-None-Match gets a 304 without the response
+    being rebuilt.
+    """
+
+    def __init__(self, store, cache_entries: int = 256):
+        self.store = store
+        self.cache_entries = cache_entries
+        self._cache: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+        self._cache_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def handle(self, path: str, query: Dict[str, List[str]], if_none_match: Optional[str] = None,
+               accept_gzip: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer one GET request, returning the status, headers and body"""
+        handler = {'/articles': self.articles, '/summary': self.summary, '/health': self.health}.get(path)
+        if handler is None:
+            return self._error(404, f"Unknown endpoint {path}")
+
+        version = self.store.version()
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in query.items())))
+        etag = 'W/"%d-%s"' % (version, hashlib.blake2b(repr(key).encode('utf-8'), digest_size=8).hexdigest())
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if if_none_match and (if_none_match.strip() == '*' or etag in
+                              [tag.strip() for tag in if_none_match.split(',')]):
+            return 304, headers, b''
+
+        entry = self._cached(version, key)
+        if entry is None:
+            try:
+                body = json.dumps(handler(query)).encode('utf-8')
+            except BadRequest as e:
+                return self._error(400, str(e))
+            entry = self._remember(version, key, {'body': body, 'gzip': None})
+
+        headers['Content-Type'] = 'application/json'
+        body = entry['body']
+        if accept_gzip and len(body) >= GZIP_MIN_BYTES:
+            if entry['gzip'] is None:
+                entry['gzip'] = gzip.compress(body, compresslevel=6)
+            body = entry['gzip']
+            headers['Content-Encoding'] = 'gzip'
+        return 200, headers, body
+
+    def _cached(self, version: int, key: Tuple) -> Optional[Dict]:
+        with self._lock:
+            if version != self._cache_version:
+                # A new ingestion run landed; every cached response is stale
+                self._cache.clear()
+                self._cache_version = version
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+            return entry
+
+    def _remember(self, version: int, key: Tuple, entry: Dict) -> Dict:
+        with self._lock:
+            if version == self._cache_version:
+                self._cache[key] = entry
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _error(status: int, message: str) -> Tuple[int, Dict[str, str], bytes]:
+        return status, {'Content-Type': 'application/json'}, json.dumps({'error': message}).encode('utf-8')
+
+    def articles(self, query: Dict[str, List[str]]) -> Dict:
+        """Return one page of articles matching the query's filters"""
+        filters = self._filters(query)
+        limit = self._int(query, 'limit', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        offset = self._int(query, 'offset', 0, 0, None)
+        order_by = self._one(query, 'sort') or 'id'
+        if order_by not in SORT_ORDERS:
+            raise BadRequest(f"sort must be one of {', '.join(SORT_ORDERS)}")
+        return {
+            'total': self.store.count(**filters),
+            'limit': limit,
+            'offset': offset,
+            'articles': list(self.store.query(limit=limit, offset=offset, order_by=order_by, **filters))
+        }
+
+    def summary(self, query: Dict[str, List[str]]) -> Dict:
+        """Return the rollups behind the dashboard charts"""
+        rollups = self.store.rollups()
+        return {
+            'total': rollups.total,
+            'risk_levels': rollups.risk_levels,
+            'sectors': rollups.sectors,
+            'impacts': rollups.impacts,
+            'daily': rollups.daily
+        }
+
+    def health(self, query: Dict[str, List[str]]) -> Dict:
+        """Return the corpus version and size"""
+        return {'status': 'ok', 'version': self.store.version(), 'articles': self.store.count()}
+
+    def _filters(self, query: Dict[str, List[str]]) -> Dict:
+        filters = {
+            'risk_level': [level.upper() for level in self._many(query, 'risk_level')],
+            'sector': self._many(query, 'sector'),
+            'impact_area': self._one(query, 'impact_area'),
+            'impact_level': (self._one(query, 'impact_level') or '').upper() or None,
+            'since': self._one(query, 'since'),
+            'until': self._one(query, 'until')
+        }
+        for name in ('since', 'until'):
+            if filters[name] and not _DATE.match(filters[name]):
+                raise BadRequest(f"{name} must be an ISO date such as 2025-03-01")
+        # A bare end date covers the whole day, as in the dashboard's date filter
+        if filters['until'] and len(filters['until']) == 10:
+            filters['until'] += 'T23:59:59Z'
+        return {name: value for name, value in filters.items() if value}
+
+    @staticmethod
+    def _many(query: Dict[str, List[str]], name: str) -> List[str]:
+        return [value.strip() for values in query.get(name, []) for value in values.split(',') if value.strip()]
+
+    @staticmethod
+    def _one(query: Dict[str, List[str]], name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[-1] if values else None
+
+    @classmethod
+    def _int(cls, query: Dict[str, List[str]], name: str, default: int, low: int,
+             high: Optional[int]) -> int:
+        value = cls._one(query, name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise BadRequest(f"{name} must be an integer") from None
+        if number < low or (high is not None and number > high):
+            raise BadRequest(f"{name} must be between {low} and {high}" if high is not None
+                             else f"{name} must be at least {low}")
+        return number
+
+
+def make_server(api: AnalysisAPI, host: str = '127.0.0.1', port: int = 8000) -> ThreadingHTTPServer:
+    """Build a threaded HTTP server answering GET requests with the API"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug("%s %s", self.address_string(), format % args)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            try:
+                status, headers, body = api.handle(
+                    url.path.rstrip('/') or '/', parse_qs(url.query),
+                    if_none_match=self.headers.get('If-None-Match'),
+                    accept_gzip='gzip' in (self.headers.get('Accept-Encoding') or ''))
+            except Exception as e:
+                # e.g. the store is locked or unreadable; answer rather than drop the connection
+                logger.exception("Error answering %s: %s", self.path, e)
+                status, headers, body = api._error(500, "Internal server error")
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    # Settings such as RESULT_STORE may come from .env, so load it before reading defaults
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Serve stored insurance climate analysis as a JSON API")
+    parser.add_argument('--store', default=os.getenv('RESULT_STORE'),
+                        help="SQLite result store to serve, e.g. the one worker.py fills")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to listen on")
+    parser.add_argument('--port', type=int, default=int(os.getenv('API_PORT', 8000)),
+                        help="port to listen on (default: API_PORT or 8000)")
+    parser.add_argument('--cache-entries', type=int, default=256,
+                        help="responses kept in memory per corpus version")
+    parser.add_argument('--json-logs', action='store_true',
+                        help="log structured JSON lines instead of plain messages")
+    args = parser.parse_args()
+    if not args.store:
+        parser.error("--store or RESULT_STORE is required")
+
+    from instrumentation import configure_logging
+    from result_store import ResultStore
+
+    configure_logging(json_logs=args.json_logs)
+    server = make_server(AnalysisAPI(ResultStore(args.store), cache_entries=args.cache_entries),
+                         args.host, args.port)
+    logger.info("Serving %s on http://%s:%d", args.store, args.host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+# Read once at import, since reading the umask means briefly changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def published_mode(path: str) -> int:
+    """Return the permissions a file written to path should get: those of the file it
+    replaces, or the usual umask-derived ones for a new file"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w') -> Iterator[IO]:
+    """Write to a temporary file next to path, then rename it into place.
+
+    Readers never see a partial write. The temporary file is created private
+    by ``mkstemp``, so it gets the permissions of ``published_mode`` before
+    the rename; otherwise every save would make the file unreadable to other
+    users, such as a dashboard running under another account.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.chmod(tmp_path, published_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,232 @@
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# Days per chunk for each --chunk choice
+CHUNK_DAYS = {'day': 1, 'week': 7}
+
+# As in worker.py, the agent and the result store are imported when a backfill
+# is built so argument errors and --help return immediately.
+
+
+def date_chunks(start: date, end: date, chunk: str = 'day') -> List[Tuple[date, date]]:
+    """Split an inclusive date range into consecutive (first, last) day or week chunks"""
+    step = timedelta(days=CHUNK_DAYS[chunk])
+    chunks = []
+    while start <= end:
+        last = min(start + step - timedelta(days=1), end)
+        chunks.append((start, last))
+        start = last + timedelta(days=1)
+    return chunks
+
+
+def chunk_key(chunk: Tuple[date, date]) -> str:
+    """Return the checkpoint key of a chunk, e.g. "2024-03-01/2024-03-07\""""
+    return f"{chunk[0].isoformat()}/{chunk[1].isoformat()}"
+
+
+class Backfill:
+    """Resumable historical ingestion over an arbitrary date range.
+
+    The range is split into day or week chunks that run ``workers`` at a
+    time on one shared agent, so its pooled session, per-host politeness
+    limits and scrape cache apply across chunks. Every NewsAPI request of the
+    backfill counts against one shared budget of ``max_requests``. A finished
+    chunk is appended to the result store in one transaction and then
+    recorded in the checkpoint file, so an interrupted backfill resumes at the
+    chunks that did not finish. A chunk cut short by the request budget is
+    stored but not checkpointed, and is fetched again by the next run.
+    """
+
+    def __init__(self, store_path: str, start: date, end: date, chunk: str = 'day', workers: int = 2,
+                 max_requests: Optional[int] = None, checkpoint: Optional[str] = None, agent=None,
+                 metrics=None, **agent_options):
+        from instrumentation import NullMetrics
+        from insurance_climate_agent import InsuranceClimateAgent
+        from news_fetcher import RequestBudget
+        from result_store import ResultStore
+
+        if chunk not in CHUNK_DAYS:
+            raise ValueError(f"Unknown chunk size {chunk!r}; expected one of {', '.join(CHUNK_DAYS)}")
+        if start > end:
+            raise ValueError(f"Backfill start {start} is after its end {end}")
+
+        self.start = start
+        self.end = end
+        self.chunk = chunk
+        self.workers = max(1, workers)
+        self.metrics = metrics or NullMetrics()
+        self.agent = agent or InsuranceClimateAgent(metrics=self.metrics, **agent_options)
+        self.store = ResultStore(store_path)
+        self.budget = RequestBudget(max_requests)
+        self.checkpoint = checkpoint or os.path.splitext(store_path)[0] + '.backfill.json'
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.completed = self.load_checkpoint()
+
+    def load_checkpoint(self) -> Dict[str, Dict]:
+        """Return the chunks a previous run of the same backfill completed, keyed by chunk_key"""
+        try:
+            with open(self.checkpoint, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.checkpoint, e)
+            return {}
+        # Chunks searched with other queries do not cover this backfill
+        if data.get('queries') != self.agent.queries:
+            logger.warning("Checkpoint %s was written for different queries; starting over", self.checkpoint)
+            return {}
+        return data.get('chunks', {})
+
+    def _save_checkpoint(self):
+        from insurance_climate_agent import write_json_atomic
+
+        write_json_atomic(self.checkpoint, {'queries': self.agent.queries, 'chunks': self.completed},
+                          indent=2)
+
+    def pending_chunks(self) -> List[Tuple[date, date]]:
+        """Return the chunks of the range that are not checkpointed yet, oldest first"""
+        return [chunk for chunk in date_chunks(self.start, self.end, self.chunk)
+                if chunk_key(chunk) not in self.completed]
+
+    def run_chunk(self, chunk: Tuple[date, date]) -> Optional[Dict]:
+        """Ingest one chunk into the store, returning its stats, or None if it did not complete"""
+        if self._stop.is_set() or self.budget.exhausted:
+            return None
+
+        from news_fetcher import RequestBudget
+
+        started = time.monotonic()
+        texts = {}
+        # Draws on the shared budget, but only records refusals of this chunk's own requests
+        budget = RequestBudget(parent=self.budget)
+        articles = list(self.agent.iter_insurance_climate_news(
+            start_date=chunk[0], end_date=chunk[1], budget=budget,
+            known_urls=self.store.known_urls, texts=texts))
+        written = self.store.append(articles, texts, self.agent.taxonomy_version)
+        seconds = time.monotonic() - started
+        self.metrics.observe('backfill_chunk_seconds', seconds)
+
+        if budget.exhausted:
+            logger.warning("Request budget ran out during %s; %d articles stored, chunk left for the next run",
+                           chunk_key(chunk), written)
+            self.metrics.inc('backfill_chunks_total', result='budget')
+            return None
+
+        stats = {'articles': written, 'seconds': round(seconds, 3),
+                 'completed_at': datetime.now().isoformat()}
+        with self._lock:
+            self.completed[chunk_key(chunk)] = stats
+            self._save_checkpoint()
+        self.metrics.inc('backfill_chunks_total', result='ok')
+        return stats
+
+    def run(self) -> Dict:
+        """Process every pending chunk, returning a summary of the run"""
+        total = len(date_chunks(self.start, self.end, self.chunk))
+        pending = self.pending_chunks()
+        logger.info("Backfilling %s to %s: %d of %d %s chunks to go, %d workers", self.start, self.end,
+                    len(pending), total, self.chunk, self.workers)
+
+        started = time.monotonic()
+        articles = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.run_chunk, chunk): chunk for chunk in pending}
+            for future in as_completed(futures):
+                key = chunk_key(futures[future])
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    logger.error("Backfill chunk %s failed: %s", key, e)
+                    self.metrics.inc('backfill_chunks_total', result='error')
+                    continue
+                if stats is None:
+                    continue
+                articles += stats['articles']
+                elapsed = time.monotonic() - started
+                logger.info("[%d/%d] %s: %d articles in %.1fs (%.2f articles/s); %.2f articles/s overall, "
+                            "%d NewsAPI requests used", len(self.completed), total, key, stats['articles'],
+                            stats['seconds'], stats['articles'] / max(stats['seconds'], 1e-9),
+                            articles / max(elapsed, 1e-9), self.budget.used)
+
+        remaining = len(self.pending_chunks())
+        if remaining:
+            logger.warning("%d chunks left unfinished; run the same backfill again to resume", remaining)
+        return {'chunks': total, 'completed': total - remaining, 'articles': articles,
+                'requests': self.budget.used, 'seconds': round(time.monotonic() - started, 3)}
+
+    def stop(self):
+        """Finish the chunks in progress and start no new ones"""
+        self._stop.set()
+
+
+def parse_date(value: str) -> date:
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def main():
+    # Settings such as RESULT_STORE may come from .env, so load it before reading defaults
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Backfill insurance climate news over a date range")
+    parser.add_argument('--start', type=parse_date, required=True, help="first day to ingest (YYYY-MM-DD)")
+    parser.add_argument('--end', type=parse_date, default=date.today(),
+                        help="last day to ingest (YYYY-MM-DD, default: today)")
+    parser.add_argument('--chunk', choices=sorted(CHUNK_DAYS), default='day',
+                        help="search the range one day or one week at a time")
+    parser.add_argument('--workers', type=int, default=2, help="chunks processed in parallel")
+    parser.add_argument('--max-requests', type=int,
+                        help="NewsAPI requests the whole backfill may send (default: unlimited)")
+    parser.add_argument('--store', default=os.getenv('RESULT_STORE'),
+                        help="SQLite result store to fill, shared with live ingestion")
+    parser.add_argument('--checkpoint',
+                        help="checkpoint file of completed chunks (default: next to the store)")
+    parser.add_argument('--query', action='append', dest='queries',
+                        help="NewsAPI query to run; repeat to search several variants")
+    parser.add_argument('--json-logs', action='store_true',
+                        help="log structured JSON lines instead of plain messages")
+    parser.add_argument('--metrics-file', default=os.getenv('METRICS_FILE'),
+                        help="write Prometheus metrics to this file when the backfill ends")
+    parser.add_argument('--parse-processes', type=int, default=int(os.getenv('PARSE_PROCESSES', 0)),
+                        help="processes that extract and score pages while threads download them "
+                             "(default: PARSE_PROCESSES or 0, parse in the scraper threads)")
+    args = parser.parse_args()
+    if not args.store:
+        parser.error("--store or RESULT_STORE is required")
+
+    from instrumentation import Metrics, NullMetrics, configure_logging
+
+    configure_logging(json_logs=args.json_logs)
+    metrics = Metrics() if args.json_logs or args.metrics_file else NullMetrics()
+
+    backfill = Backfill(args.store, args.start, args.end, chunk=args.chunk, workers=args.workers,
+                        max_requests=args.max_requests, checkpoint=args.checkpoint, metrics=metrics,
+                        cache_dir=os.getenv('SCRAPE_CACHE_DIR'), queries=args.queries,
+                        parse_processes=args.parse_processes)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: backfill.stop())
+    try:
+        summary = backfill.run()
+    finally:
+        backfill.agent.close()
+    logger.info("Backfill finished: %d/%d chunks, %d articles, %d NewsAPI requests in %.1fs",
+                summary['completed'], summary['chunks'], summary['articles'], summary['requests'],
+                summary['seconds'])
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from insurance_climate_agent import InsuranceClimateAgent
+from html_extract import extract_article_text
+
+FILLER_WORDS = (
+    "the a of and to in is was for on with as by at from that this it were said "
+    "storm flood wildfire drought insurer reinsurer region report climate weather "
+    "coverage losses homeowners state year season according officials"
+).split()
+
+
+def synthetic_text(agent: InsuranceClimateAgent, words: int, keyword_ratio: float = 0.02,
+                   rng: random.Random = None) -> str:
+    """Generate article-like text with a sprinkling of taxonomy keywords"""
+    rng = rng or random.Random(0)
+    keywords = agent.taxonomy_keywords()
+    return ' '.join(
+        rng.choice(keywords) if rng.random() < keyword_ratio else rng.choice(FILLER_WORDS)
+        for _ in range(words)
+    )
+
+
+def synthetic_page(agent: InsuranceClimateAgent, paragraphs: int,
+                   rng: random.Random = None) -> str:
+    """Generate a news-style HTML page with boilerplate around an article body"""
+    rng = rng or random.Random(0)
+    script = "<script>window.__DATA__ = {" + ",".join(
+        f'"k{i}": "{rng.random()}"' for i in range(200)) + "};</script>"
+    nav = "<nav><ul>" + "".join(
+        f"<li><a href='/s/{i}'>Section {i}</a></li>" for i in range(40)) + "</ul></nav>"
+    body = "".join(
+        f"<p>{synthetic_text(agent, 80, rng=rng)} &amp; <b>more</b> &#8220;quoted&#8221;</p>"
+        + (f"<aside>Related story {i}</aside>" if i % 5 == 0 else "")
+        for i in range(paragraphs)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Story</title>"
+        f"<style>body {{ margin: 0 }}</style>{script}</head>"
+        f"<body><header><h1>News</h1>{nav}</header><main><article>{body}</article>"
+        f"<section>Most read</section></main>{script}<footer>Footer text</footer></body></html>"
+    )
+
+
+def legacy_extract(html: str) -> str:
+    """Extract article text with the BeautifulSoup tree walk used before streaming"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in ['script', 'style', 'nav', 'header', 'footer', 'aside']:
+        for element in soup.find_all(tag):
+            element.decompose()
+    content = soup.find('article') or soup.find('main') or soup.find('body')
+    return content.get_text() if content else ""
+
+
+def streaming_extract(html: str, chunk_size: int = 16 * 1024) -> str:
+    """Extract article text by feeding the encoded page to the streaming extractor"""
+    data = html.encode('utf-8')
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    return extract_article_text(chunks)
+
+
+def peak_memory(func: Callable, text: str) -> int:
+    """Return the peak traced allocation in bytes while running func on text"""
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def legacy_score(agent: InsuranceClimateAgent, text: str) -> Dict:
+    """Score text the way the per-method substring scans did before the matcher"""
+    lowered = text.lower()
+    risk_scores = {}
+    for level, indicators in agent.risk_indicators.items():
+        risk_scores[level] = (
+            sum(1 for k in indicators['keywords'] if k in lowered) * indicators['weight'] +
+            sum(1 for k in indicators['numerical_indicators'] if k in lowered) * (indicators['weight'] * 1.5) +
+            sum(1 for k in indicators['temporal_indicators'] if k in lowered) * (indicators['weight'] * 0.8)
+        )
+    lowered = text.lower()
+    sectors = [sector for sector, keywords in agent.insurance_sectors.items()
+               if any(k in lowered for k in keywords)]
+    lowered = text.lower()
+    impacts = {area: sum(1 for k in keywords if k in lowered)
+               for area, keywords in agent.impact_areas.items()}
+    return {'risk': risk_scores, 'sectors': sectors, 'impacts': impacts}
+
+
+def time_per_call(func: Callable, texts: List[str], repeat: int) -> float:
+    """Return the best average seconds per call over several rounds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, (time.perf_counter() - start) / len(texts))
+    return best
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop connections once they have enough of a page; not worth a traceback
+        pass
+
+
+class StubNewsServer:
+    """Local stand-in for NewsAPI and publisher sites, serving synthetic data.
+
+    ``/v2/everything`` returns paginated NewsAPI payloads whose article URLs
+    point at ``/articles/<n>`` on the same server, and each of those serves a
+    synthetic news page after an optional delay.
+    """
+
+    def __init__(self, pages: List[str], delay: float = 0.0):
+        self.pages = [page.encode('utf-8') for page in pages]
+        self.delay = delay
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/v2/everything':
+                    body = json.dumps(server.news_payload(parse_qs(url.query))).encode('utf-8')
+                    content_type = 'application/json'
+                elif url.path.startswith('/articles/'):
+                    if server.delay:
+                        time.sleep(server.delay)
+                    body = server.pages[int(url.path.rsplit('/', 1)[1]) % len(server.pages)]
+                    content_type = 'text/html; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = _QuietHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}"
+        self.articles = len(self.pages)
+
+    def news_payload(self, query: Dict) -> Dict:
+        """Build one page of a NewsAPI /v2/everything response"""
+        page = int(query.get('page', ['1'])[0])
+        page_size = int(query.get('pageSize', ['100'])[0])
+        first = (page - 1) * page_size
+        return {
+            'status': 'ok',
+            'totalResults': self.articles,
+            'articles': [{
+                'source': {'id': None, 'name': f"Publisher {i % 7}"},
+                'title': f"Synthetic climate insurance story {i}",
+                'description': "Insurers assess losses after the storm",
+                'url': f"{self.base_url}/articles/{i}",
+                'publishedAt': f"2025-03-{1 + i % 28:02d}T{i % 24:02d}:00:00Z",
+                'content': "Severe flooding raised claims across the region"
+            } for i in range(first, min(first + page_size, self.articles))]
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def stage_summary(latencies: List[float], elapsed: float, items: int) -> Dict:
+    """Summarize per-item latencies and throughput of one pipeline stage"""
+    return {
+        'items': items,
+        'seconds': elapsed,
+        'throughput': items / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1e3,
+        'p90_ms': percentile(latencies, 90) * 1e3,
+        'p99_ms': percentile(latencies, 99) * 1e3
+    }
+
+
+def timed_each(func: Callable, inputs: List, latencies: List[float]) -> List:
+    """Apply func to every input, recording each call's latency"""
+    results = []
+    for item in inputs:
+        start = time.perf_counter()
+        results.append(func(item))
+        latencies.append(time.perf_counter() - start)
+    return results
+
+
+def run_pipeline(args) -> Dict:
+    """Run the full pipeline against the stub server and time every stage"""
+    rng = random.Random(args.seed)
+    page_agent = InsuranceClimateAgent()
+    pages = [synthetic_page(page_agent, args.paragraphs, rng=rng) for _ in range(args.articles)]
+
+    with StubNewsServer(pages, delay=args.delay) as server:
+        agent = InsuranceClimateAgent(max_workers=args.workers, per_host_limit=args.workers,
+                                      news_api_url=f"{server.base_url}/v2/everything",
+                                      max_pages=args.articles // 100 + 1)
+        stages = {}
+
+        start = time.perf_counter()
+        articles = agent.news_fetcher.fetch(agent.queries, {'language': 'en'})
+        elapsed = time.perf_counter() - start
+        stages['fetch'] = stage_summary([elapsed], elapsed, len(articles))
+
+        scrape_latencies = []
+        get_article_content = agent.get_article_content
+
+        def timed_scrape(url, timeout=None):
+            begin = time.perf_counter()
+            try:
+                return get_article_content(url, timeout=timeout)
+            finally:
+                scrape_latencies.append(time.perf_counter() - begin)
+
+        agent.get_article_content = timed_scrape
+        start = time.perf_counter()
+        contents = [""] * len(articles)
+        # The same generator path production runs use
+        for index, content in agent.iter_scraped([article['url'] for article in articles]):
+            contents[index] = content
+        stages['scrape'] = stage_summary(scrape_latencies, time.perf_counter() - start, len(contents))
+
+    texts = [f"{article['content']} {content}" for article, content in zip(articles, contents)]
+    for name, method in (('assess_risk_level', agent.assess_risk_level),
+                         ('identify_affected_sectors', agent.identify_affected_sectors),
+                         ('analyze_impact', agent.analyze_impact)):
+        latencies = []
+        start = time.perf_counter()
+        timed_each(method, texts, latencies)
+        stages[name] = stage_summary(latencies, time.perf_counter() - start, len(texts))
+
+    analyzed = [agent.analyze_article(article, content) for article, content in zip(articles, contents)]
+    analysis = {}
+    for article in filter(None, analyzed):
+        analysis.setdefault(article['risk_assessment']['level'], []).append(article)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        agent.save_analysis(analysis, os.path.join(directory, 'analysis.json'))
+        elapsed = time.perf_counter() - start
+        stages['save_analysis'] = stage_summary([elapsed], elapsed, len(analyzed))
+
+    return {
+        'config': {key: getattr(args, key) for key in ('articles', 'paragraphs', 'delay', 'workers', 'seed')},
+        'stages': stages,
+        # ru_maxrss is reported in KiB on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def compare_to_baseline(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """List stages whose throughput fell more than tolerance below the baseline"""
+    regressions = []
+    if baseline.get('config') != result['config']:
+        print(f"Warning: baseline was recorded with a different config: {baseline.get('config')}")
+    for name, stage in baseline['stages'].items():
+        current = result['stages'].get(name)
+        if current and current['throughput'] < stage['throughput'] * (1 - tolerance):
+            regressions.append(f"{name}: {current['throughput']:.1f}/s vs baseline "
+                               f"{stage['throughput']:.1f}/s")
+    if result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"peak RSS: {result['peak_rss_mb']:.1f} MiB vs baseline "
+                           f"{baseline['peak_rss_mb']:.1f} MiB")
+    return regressions
+
+
+def bench_pipeline(args):
+    """Time every pipeline stage end to end against a local stand-in server"""
+    result = run_pipeline(args)
+
+    print(f"Pipeline, {args.articles} articles x {args.paragraphs} paragraphs, "
+          f"{args.workers} workers, {args.delay * 1e3:.0f} ms page delay")
+    print(f"  {'stage':<26}{'items/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, stage in result['stages'].items():
+        print(f"  {name:<26}{stage['throughput']:>10.1f}{stage['p50_ms']:>10.2f}"
+              f"{stage['p90_ms']:>10.2f}{stage['p99_ms']:>10.2f}")
+    print(f"  peak RSS: {result['peak_rss_mb']:.1f} MiB")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(result, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            raise SystemExit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+def bench_keywords(args):
+    """Compare the compiled keyword matcher against per-method substring scans"""
+    agent = InsuranceClimateAgent()
+    rng = random.Random(args.seed)
+    texts = [synthetic_text(agent, args.words, rng=rng) for _ in range(args.docs)]
+
+    legacy = time_per_call(lambda text: legacy_score(agent, text), texts, args.repeat)
+    compiled = time_per_call(agent.score_content, texts, args.repeat)
+
+    print(f"Keyword scoring, {args.docs} docs x {args.words} words")
+    print(f"  per-method scans: {legacy * 1e6:10.1f} us/doc")
+    print(f"  compiled matcher: {compiled * 1e6:10.1f} us/doc")
+    print(f"  speedup:          {legacy / compiled:10.2f}x")
+
+
+def bench_extract(args):
+    """Check the streaming extractor against BeautifulSoup and compare cost"""
+    agent = InsuranceClimateAgent()
+    rng = random.Random(args.seed)
+    pages = [synthetic_page(agent, args.paragraphs, rng=rng) for _ in range(args.docs)]
+
+    for page in pages:
+        if agent.clean_text(streaming_extract(page)) != agent.clean_text(legacy_extract(page)):
+            raise SystemExit("Streaming extractor output differs from BeautifulSoup")
+
+    legacy = time_per_call(legacy_extract, pages, args.repeat)
+    streaming = time_per_call(streaming_extract, pages, args.repeat)
+    legacy_peak = peak_memory(legacy_extract, pages[0])
+    streaming_peak = peak_memory(streaming_extract, pages[0])
+
+    size = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"Article extraction, {args.docs} pages of {size:.0f} KiB (outputs identical)")
+    print(f"  BeautifulSoup: {legacy * 1e3:8.2f} ms/page, peak {legacy_peak / 1024:8.0f} KiB")
+    print(f"  streaming:     {streaming * 1e3:8.2f} ms/page, peak {streaming_peak / 1024:8.0f} KiB")
+    print(f"  speedup:       {legacy / streaming:8.2f}x")
+
+
+def bench_batch(args):
+    """Compare per-article scoring with analyze_batch, serially and across processes"""
+    agent = InsuranceClimateAgent()
+    rng = random.Random(args.seed)
+    texts = [synthetic_text(agent, args.words, rng=rng) for _ in range(args.docs)]
+
+    start = time.perf_counter()
+    expected = [agent.score_content(text) for text in texts]
+    per_article = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = agent.analyze_batch(texts)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sharded = agent.analyze_batch(texts, processes=args.processes, shard_size=args.shard_size)
+    parallel = time.perf_counter() - start
+
+    if batch != expected or sharded != expected:
+        raise SystemExit("Batch scoring output differs from per-article scoring")
+
+    print(f"Batch scoring, {args.docs} docs x {args.words} words (outputs identical)")
+    print(f"  per-article:             {args.docs / per_article:10.0f} docs/s")
+    print(f"  analyze_batch:           {args.docs / vectorized:10.0f} docs/s")
+    print(f"  analyze_batch ({args.processes} procs): {args.docs / parallel:10.0f} docs/s")
+
+
+def bench_parse(args):
+    """Compare parsing in the scraper threads with the process-pool parse stage by pool size"""
+    rng = random.Random(args.seed)
+    page_agent = InsuranceClimateAgent()
+    pages = [synthetic_page(page_agent, args.paragraphs, rng=rng) for _ in range(args.articles)]
+    cores = os.cpu_count() or 1
+    # Powers of two up to the core count, plus the core count itself
+    pool_sizes = args.processes or sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+
+    with StubNewsServer(pages, delay=args.delay) as server:
+        def run(parse_processes: int):
+            agent = InsuranceClimateAgent(max_workers=args.workers, per_host_limit=args.workers,
+                                          news_api_url=f"{server.base_url}/v2/everything",
+                                          max_pages=args.articles // 100 + 1, dedup_distance=None,
+                                          parse_processes=parse_processes)
+            try:
+                if parse_processes:
+                    # Start every worker process before timing
+                    list(agent.parse_pool.map(time.sleep, [0.2] * parse_processes))
+                start = time.perf_counter()
+                articles = list(agent.iter_insurance_climate_news(ordered=True))
+                return articles, time.perf_counter() - start
+            finally:
+                agent.close()
+
+        expected, threaded = run(0)
+        timings = {}
+        for size in pool_sizes:
+            articles, timings[size] = run(size)
+            if articles != expected:
+                raise SystemExit(f"Parse pool of {size} produced different articles than in-thread parsing")
+
+    size = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"Scrape and score, {args.articles} pages of {size:.0f} KiB, {args.workers} download threads, "
+          f"{cores} cores (outputs identical)")
+    print(f"  {'parsing':<22}{'pages/s':>10}{'speedup':>10}")
+    print(f"  {'in scraper threads':<22}{args.articles / threaded:>10.1f}{1.0:>10.2f}")
+    for processes, elapsed in timings.items():
+        print(f"  {f'{processes} processes':<22}{args.articles / elapsed:>10.1f}{threaded / elapsed:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Insurance climate agent benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    keywords = subparsers.add_parser('keywords', help=bench_keywords.__doc__)
+    keywords.add_argument('--docs', type=int, default=50)
+    keywords.add_argument('--words', type=int, default=5000)
+    keywords.add_argument('--repeat', type=int, default=5)
+    keywords.add_argument('--seed', type=int, default=0)
+    keywords.set_defaults(func=bench_keywords)
+
+    extract = subparsers.add_parser('extract', help=bench_extract.__doc__)
+    extract.add_argument('--docs', type=int, default=20)
+    extract.add_argument('--paragraphs', type=int, default=60)
+    extract.add_argument('--repeat', type=int, default=3)
+    extract.add_argument('--seed', type=int, default=0)
+    extract.set_defaults(func=bench_extract)
+
+    batch = subparsers.add_parser('batch', help=bench_batch.__doc__)
+    batch.add_argument('--docs', type=int, default=5000)
+    batch.add_argument('--words', type=int, default=1000)
+    batch.add_argument('--processes', type=int, default=4)
+    batch.add_argument('--shard-size', type=int, default=500)
+    batch.add_argument('--seed', type=int, default=0)
+    batch.set_defaults(func=bench_batch)
+
+    parse = subparsers.add_parser('parse', help=bench_parse.__doc__)
+    parse.add_argument('--articles', type=int, default=200)
+    parse.add_argument('--paragraphs', type=int, default=60)
+    parse.add_argument('--delay', type=float, default=0.0, help="seconds before each page is served")
+    parse.add_argument('--workers', type=int, default=8)
+    parse.add_argument('--processes', type=int, nargs='+',
+                       help="parse pool sizes to compare (default: powers of two up to the core count)")
+    parse.add_argument('--seed', type=int, default=0)
+    parse.set_defaults(func=bench_parse)
+
+    pipeline = subparsers.add_parser('pipeline', help=bench_pipeline.__doc__)
+    pipeline.add_argument('--articles', type=int, default=200)
+    pipeline.add_argument('--paragraphs', type=int, default=40)
+    pipeline.add_argument('--delay', type=float, default=0.0, help="seconds before each page is served")
+    pipeline.add_argument('--workers', type=int, default=8)
+    pipeline.add_argument('--seed', type=int, default=0)
+    pipeline.add_argument('--save-baseline', metavar='PATH', help="write the results as a baseline")
+    pipeline.add_argument('--baseline', metavar='PATH', help="fail if slower than this baseline")
+    pipeline.add_argument('--tolerance', type=float, default=0.2,
+                          help="allowed relative slowdown before a stage counts as a regression")
+    pipeline.set_defaults(func=bench_pipeline)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FINGERPRINT_BITS = 64
+
+# Hamming distance at or below which two fingerprints count as the same story.
+# Lightly edited wire copies of a short NewsAPI summary land around 5-7 bits
+# apart; unrelated articles are typically ~32 bits apart.
+DEFAULT_MAX_DISTANCE = 8
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# NewsAPI truncates content and appends e.g. "… [+2345 chars]"
+_TRUNCATION_MARKER = re.compile(r'\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]\s*$')
+
+
+def article_text(article: Dict) -> str:
+    """Return the title, description and content of a NewsAPI article as one text"""
+    content = _TRUNCATION_MARKER.sub('', article.get('content') or '')
+    return ' '.join(filter(None, [article.get('title'), article.get('description'), content]))
+
+
+def article_fingerprint(article: Dict, min_words: int = 8) -> Optional[int]:
+    """Return the SimHash of a NewsAPI article, or None if it has too little text to compare"""
+    text = article_text(article)
+    if len(_WORD.findall(text.lower())) < min_words:
+        return None
+    return simhash(text)
+
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    """Return the 64-bit SimHash of a text's word shingles.
+
+    Shingles are hashed with BLAKE2b rather than ``hash()`` so fingerprints
+    are stable across processes and can be persisted.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) > shingle_size:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    else:
+        shingles = [' '.join(words)] if words else []
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the bits in which two fingerprints differ"""
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """SimHash index answering "is there a stored fingerprint within k bits of this one?".
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    that differ in at most ``max_distance`` bits must agree exactly on at
+    least one band, so a lookup only compares the candidates that share a
+    band instead of scanning the whole index.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        band_count = max_distance + 1
+        width, extra = divmod(FINGERPRINT_BITS, band_count)
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for band in range(band_count):
+            band_width = width + (1 if band < extra else 0)
+            self._bands.append((shift, (1 << band_width) - 1))
+            shift += band_width
+
+        self._fingerprints: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in self._bands]
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, key: str, fingerprint: int):
+        """Index a fingerprint under a key, e.g. the representative article's URL"""
+        if key in self._fingerprints:
+            return
+        self._fingerprints[key] = fingerprint
+        for buckets, (shift, mask) in zip(self._buckets, self._bands):
+            buckets.setdefault(fingerprint >> shift & mask, []).append(key)
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Return the key of the closest indexed fingerprint within max_distance, if any"""
+        best_key, best_distance = None, self.max_distance + 1
+        for buckets, (shift, mask) in zip(self._buckets, self._bands):
+            for key in buckets.get(fingerprint >> shift & mask, ()):
+                distance = hamming_distance(fingerprint, self._fingerprints[key])
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+        return best_key
+
+    def items(self) -> Iterable[Tuple[str, int]]:
+        """Return every (key, fingerprint) pair"""
+        return self._fingerprints.items()
@@ -0,0 +1,174 @@
+import json
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from atomic_file import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of one article download
+TEXT = 'text'      # the page yielded article text
+EMPTY = 'empty'    # the page loaded but had little or no article text, e.g. a paywall
+FAILED = 'failed'  # timeout, connection error or HTTP error status
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+class DomainStats:
+    """Per-publisher scraping history driving timeouts, a circuit breaker and a skip list.
+
+    The last ``window`` downloads of every host are kept with their latency
+    and outcome, and persisted to ``path`` between runs when one is given.
+    From them:
+
+    * the request timeout of a host shrinks to ``timeout_factor`` times its
+      p95 latency (never below ``min_timeout`` or above the default timeout),
+      so one slow page cannot hold up the run's tail;
+    * ``failure_threshold`` consecutive failures open the host's circuit for
+      ``cooldown`` seconds, after which a single trial request may close it;
+    * a host with ``min_samples`` recent downloads and none yielding at least
+      ``min_text_chars`` of text is skipped, with one probe per
+      ``probe_interval`` to notice a change.
+
+    Skipped articles are scored on their NewsAPI content or description.
+    """
+
+    def __init__(self, path: Optional[str] = None, window: int = 50, min_samples: int = 10,
+                 timeout_factor: float = 3.0, min_timeout: float = 2.0, failure_threshold: int = 5,
+                 cooldown: float = 30 * 60, probe_interval: float = 24 * 3600, min_text_chars: int = 200):
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_factor = timeout_factor
+        self.min_timeout = min_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.min_text_chars = min_text_chars
+
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict] = self._load() if path else {}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable domain stats %s: %s", self.path, e)
+            return {}
+
+    def save(self):
+        """Write the statistics to ``path``, atomically replacing the previous file"""
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._hosts)
+        with atomic_write(self.path) as f:
+            f.write(data)
+
+    def _host(self, host: str) -> Dict:
+        return self._hosts.setdefault(host, {'recent': [], 'consecutive_failures': 0,
+                                             'open_until': 0.0, 'last_probe': 0.0})
+
+    def timeout(self, host: str, default: float) -> float:
+        """Return the request timeout for a host given the configured default"""
+        with self._lock:
+            stats = self._hosts.get(host)
+            latencies = [seconds for seconds, outcome in stats['recent'] if outcome != FAILED] if stats else []
+        if len(latencies) < self.min_samples:
+            return default
+        return min(default, max(self.min_timeout, percentile(latencies, 95) * self.timeout_factor))
+
+    def skip_reason(self, host: str) -> Optional[str]:
+        """Return why a host should not be requested now ('circuit_open' or 'no_text'), or None.
+
+        Once a host's cooldown or probe interval has passed, exactly one caller
+        is let through and the rest keep being turned away until its result
+        is recorded.
+        """
+        now = time.time()
+        with self._lock:
+            stats = self._hosts.get(host)
+            if not stats:
+                return None
+
+            if stats['consecutive_failures'] >= self.failure_threshold:
+                if now < stats['open_until']:
+                    return 'circuit_open'
+                # Half-open: this request is the trial, everyone else waits for its result
+                stats['open_until'] = now + self.cooldown
+                return None
+
+            recent = stats['recent']
+            if len(recent) >= self.min_samples and all(outcome != TEXT for _, outcome in recent):
+                if now - stats['last_probe'] < self.probe_interval:
+                    return 'no_text'
+                stats['last_probe'] = now
+            return None
+
+    def record(self, host: str, seconds: float, failed: bool = False, chars: int = 0):
+        """Record the latency of one download and whether it failed or how much text it yielded"""
+        outcome = FAILED if failed else TEXT if chars >= self.min_text_chars else EMPTY
+        with self._lock:
+            stats = self._host(host)
+            stats['recent'].append([round(seconds, 4), outcome])
+            del stats['recent'][:-self.window]
+            if outcome == FAILED:
+                stats['consecutive_failures'] += 1
+                if stats['consecutive_failures'] >= self.failure_threshold:
+                    stats['open_until'] = time.time() + self.cooldown
+            else:
+                stats['consecutive_failures'] = 0
+                stats['open_until'] = 0.0
+
+    def rearm(self, host: str):
+        """Let the next request be a host's trial or probe again after a result was not recorded.
+
+        Called when a request's outcome says nothing about the host, e.g. the
+        run deadline cut it short; otherwise a trial or probe that never
+        reports back would keep the host closed for another cooldown or probe
+        interval.
+        """
+        with self._lock:
+            stats = self._hosts.get(host)
+            if not stats:
+                return
+            if stats['consecutive_failures'] >= self.failure_threshold:
+                stats['open_until'] = 0.0
+            else:
+                stats['last_probe'] = 0.0
+
+    def summary(self) -> Dict[str, Dict]:
+        """Return success rate, latency percentiles and text yield per host"""
+        now = time.time()
+        summary = {}
+        with self._lock:
+            for host, stats in self._hosts.items():
+                recent = stats['recent']
+                latencies = [seconds for seconds, outcome in recent if outcome != FAILED]
+                attempts = len(recent)
+                if stats['consecutive_failures'] >= self.failure_threshold and now < stats['open_until']:
+                    state = 'open'
+                elif attempts >= self.min_samples and all(outcome != TEXT for _, outcome in recent):
+                    state = 'skipped'
+                else:
+                    state = 'ok'
+                summary[host] = {
+                    'attempts': attempts,
+                    'success_rate': len(latencies) / attempts if attempts else 0.0,
+                    'text_yield': sum(outcome == TEXT for _, outcome in recent) / attempts if attempts else 0.0,
+                    'p50_seconds': percentile(latencies, 50),
+                    'p95_seconds': percentile(latencies, 95),
+                    'state': state
+                }
+        return summary
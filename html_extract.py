@@ -0,0 +1,210 @@
+import codecs
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+
+# Elements whose whole subtree is dropped before extracting text
+SKIPPED_TAGS = frozenset(['script', 'style', 'nav', 'header', 'footer', 'aside'])
+
+# Candidate content roots, in order of preference
+CONTENT_TAGS = ('article', 'main', 'body')
+
+# Tags closed as soon as they are opened, and tags whose strings are not
+# ordinary text, matching BeautifulSoup's html.parser tree builder
+VOID_TAGS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame',
+    'hr', 'image', 'img', 'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta',
+    'nextid', 'param', 'source', 'spacer', 'track', 'wbr'
+])
+STRING_CONTAINER_TAGS = frozenset(['rt', 'rp', 'style', 'script', 'template'])
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+NAMED_ENTITIES = {name[:-1]: char for name, char in html5.items() if name.endswith(';')}
+
+_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def clean_text(text: str) -> str:
+    """Strip leftover tags and collapse whitespace in extracted text"""
+    if not text:
+        return ""
+    text = _TAG.sub('', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class ArticleTextExtractor(HTMLParser):
+    """Single-pass, tree-free equivalent of the BeautifulSoup article extraction.
+
+    Feeding a page produces the same text as parsing it with ``html.parser``,
+    decomposing every script/style/nav/header/footer/aside element and calling
+    ``get_text()`` on the first remaining article, main or body element. Only
+    the open-tag stack is kept, never the document tree. Once the first
+    article has closed, the result can no longer change and ``done`` is set.
+    """
+
+    def __init__(self, max_text_chars: Optional[int] = None):
+        super().__init__(convert_charrefs=False)
+        self.max_text_chars = max_text_chars
+        self.done = False
+
+        # Open elements as (name, role) pairs; role is set on the first
+        # article/main/body outside a skipped subtree
+        self._stack: List[tuple] = []
+        self._open_counts = {}
+        self._already_closed: List[str] = []
+        self._skipping = 0
+        self._containers = 0
+
+        self._text = {tag: [] for tag in CONTENT_TAGS}
+        self._found = set()
+        self._active: List[str] = []
+        self._article_chars = 0
+
+    def text(self) -> str:
+        """Return the raw text of the preferred content element, or '' if none was found"""
+        for tag in CONTENT_TAGS:
+            if tag in self._found:
+                return ''.join(self._text[tag])
+        return ""
+
+    def _push(self, name: str):
+        role = None
+        if not self._skipping and name in CONTENT_TAGS and name not in self._found:
+            role = name
+            self._found.add(name)
+            self._active.append(name)
+        if name in SKIPPED_TAGS:
+            self._skipping += 1
+        if name in STRING_CONTAINER_TAGS:
+            self._containers += 1
+        self._stack.append((name, role))
+        self._open_counts[name] = self._open_counts.get(name, 0) + 1
+
+    def _pop_to(self, name: str):
+        # Like BeautifulSoup, close every element above the most recent open
+        # element with this name, and ignore end tags with no open element
+        if not self._open_counts.get(name):
+            return
+        while self._stack:
+            popped, role = self._stack.pop()
+            self._open_counts[popped] -= 1
+            if popped in SKIPPED_TAGS:
+                self._skipping -= 1
+            if popped in STRING_CONTAINER_TAGS:
+                self._containers -= 1
+            if role:
+                self._active.remove(role)
+                if role == 'article':
+                    self.done = True
+            if popped == name:
+                break
+
+    def _append(self, data: str, cdata: bool = False):
+        if self._skipping or not self._active or (self._containers and not cdata):
+            return
+        for role in self._active:
+            self._text[role].append(data)
+        if 'article' in self._active:
+            self._article_chars += len(data)
+            if self.max_text_chars and self._article_chars >= self.max_text_chars:
+                self.done = True
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self._push(tag)
+        if tag in VOID_TAGS and handle_empty_element:
+            self._pop_to(tag)
+            self._already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._already_closed:
+            self._already_closed.remove(tag)
+        else:
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._append(data)
+
+    def handle_charref(self, name):
+        if name[:1] in ('x', 'X'):
+            codepoint = int(name[1:].lstrip('xX'), 16)
+        else:
+            codepoint = int(name)
+        data = None
+        # Numeric references below 256 are usually meant as Windows-1252
+        if codepoint < 256:
+            try:
+                data = bytes([codepoint]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(codepoint)
+            except (ValueError, OverflowError):
+                pass
+        self._append(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        self._append(NAMED_ENTITIES.get(name, f"&{name}"))
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self._append(data[len('CDATA['):], cdata=True)
+
+
+def extract_article_text(chunks: Iterable[bytes], encoding: str = 'utf-8',
+                         max_bytes: Optional[int] = None,
+                         max_text_chars: Optional[int] = None,
+                         stats: Optional[Dict] = None) -> str:
+    """Extract article text from a stream of HTML byte chunks.
+
+    Reading stops once ``max_bytes`` have been consumed or the extractor
+    knows the final result. If a ``stats`` dict is given, the number of bytes
+    read is stored in it under ``'bytes'``.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = ArticleTextExtractor(max_text_chars=max_text_chars)
+
+    consumed = 0
+    try:
+        for chunk in chunks:
+            if max_bytes is not None and consumed + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - consumed]
+            consumed += len(chunk)
+            extractor.feed(decoder.decode(chunk))
+            if extractor.done or (max_bytes is not None and consumed >= max_bytes):
+                break
+        else:
+            extractor.feed(decoder.decode(b'', final=True))
+    finally:
+        if stats is not None:
+            stats['bytes'] = consumed
+
+    if not extractor.done:
+        extractor.close()
+    return extractor.text()
+
+
+def extract_response_text(response, max_bytes: Optional[int] = None,
+                          max_text_chars: Optional[int] = None,
+                          chunk_size: int = 16 * 1024, stats: Optional[Dict] = None) -> str:
+    """Extract article text from a streamed requests response, skipping non-HTML bodies"""
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        return ""
+    return extract_article_text(
+        response.iter_content(chunk_size=chunk_size),
+        encoding=response.encoding or 'utf-8',
+        max_bytes=max_bytes,
+        max_text_chars=max_text_chars,
+        stats=stats
+    )
@@ -0,0 +1,204 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Tuple
+
+from atomic_file import atomic_write
+
+# Histogram bucket upper bounds in seconds, from fast CPU work to slow publishers
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms with JSON and Prometheus export.
+
+    ``inc`` adds to a counter, ``observe`` records a duration in a histogram,
+    ``timer`` times a block, and ``event`` emits one structured JSON log line.
+    Metric names follow Prometheus conventions: counters end in ``_total`` and
+    histograms in ``_seconds``.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one duration in a histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the enclosed block into a histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def event(self, name: str, **fields):
+        """Emit a structured JSON log line"""
+        logger.info(json.dumps({'event': name, 'ts': time.time(), **fields}, default=str))
+
+    def snapshot(self) -> Dict:
+        """Return all counters and histograms as plain, JSON-serializable data"""
+        with self._lock:
+            return {
+                'counters': {
+                    name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: [{
+                        'labels': dict(key),
+                        'count': histogram['count'],
+                        'sum': histogram['sum'],
+                        'buckets': dict(zip(map(str, self.buckets), histogram['buckets']))
+                    } for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                }
+            }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        def labels_text(key: Tuple, extra: Tuple = ()) -> str:
+            pairs = list(key) + list(extra)
+            if not pairs:
+                return ''
+            escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                       for _, value in pairs)
+            return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f'# TYPE {name} counter')
+                for key, value in series.items():
+                    lines.append(f'{name}{labels_text(key)} {value}')
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f'# TYPE {name} histogram')
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram['buckets']):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{labels_text(key, (("le", str(bound)),))} {cumulative}')
+                    lines.append(f'{name}_bucket{labels_text(key, (("le", "+Inf"),))} {histogram["count"]}')
+                    lines.append(f'{name}_sum{labels_text(key)} {histogram["sum"]}')
+                    lines.append(f'{name}_count{labels_text(key)} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Atomically write the Prometheus text file, e.g. for node_exporter's textfile collector"""
+        self._write_atomic(path, self.to_prometheus())
+
+    def write_json(self, path: str):
+        """Atomically write the metrics snapshot as JSON"""
+        self._write_atomic(path, json.dumps(self.snapshot(), indent=2))
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        with atomic_write(path) as f:
+            f.write(content)
+
+    def serve(self, port: int, host: str = '0.0.0.0'):
+        """Serve /metrics in Prometheus format from a daemon thread, returning the server"""
+        # Only long-running processes serve metrics, so one-off runs skip this import
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+        return server
+
+
+class NullMetrics(Metrics):
+    """Disabled metrics: every call is a no-op, so instrumentation costs next to nothing"""
+
+    enabled = False
+    _null_timer = nullcontext()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, seconds: float, **labels):
+        pass
+
+    def timer(self, name: str, **labels):
+        return self._null_timer
+
+    def event(self, name: str, **fields):
+        pass
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        try:
+            payload = json.loads(message)
+            if not isinstance(payload, dict):
+                raise ValueError
+        except ValueError:
+            payload = {'message': message}
+        payload.setdefault('ts', record.created)
+        payload['level'] = record.levelname
+        payload['logger'] = record.name
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(json_logs: bool = False, level: int = logging.INFO):
+    """Send log records to stderr, either as plain messages or as JSON lines"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonLogFormatter() if json_logs else logging.Formatter('%(message)s'))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
@@ -1,98 +1,605 @@
+import argparse
+import logging
+import multiprocessing
 import os
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-import re
+from datetime import date, datetime, timedelta
+import queue
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 import json
-from typing import Dict, List
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from atomic_file import atomic_write
+from keyword_matcher import KeywordMatcher
+from scrape_cache import ScrapeCache
+from domain_stats import DomainStats
+from html_extract import HTML_CONTENT_TYPES, clean_text, extract_response_text
+from news_fetcher import NEWS_API_URL, NewsAPIError, NewsAPIFetcher, RequestBudget
+from instrumentation import Metrics, NullMetrics, configure_logging
+from dedup import DEFAULT_MAX_DISTANCE, NearDuplicateIndex, article_fingerprint
+from taxonomy import load_taxonomy
 
 # Load API key from .env file
 load_dotenv()
 NEWS_API_KEY = os.getenv('NEWSAPI_KEY')
 
+# Default search focused on insurance and climate risk
+DEFAULT_QUERY = '(climate risk OR climate change OR natural disaster) AND (insurance OR reinsurance OR risk assessment)'
+
+# Incremental runs search again from this long before the newest article seen, since
+# articles published just before it may not have been fetched yet
+HIGH_WATER_MARK_OVERLAP = timedelta(hours=24)
+
+logger = logging.getLogger(__name__)
+
 class InsuranceClimateAgent:
-    def __init__(self):
-        self.risk_levels = {
-            'HIGH': 3,
-            'MEDIUM': 2,
-            'LOW': 1
-        }
-        
-        self.insurance_sectors = {
-            'Property': ['property damage', 'real estate', 'building', 'infrastructure', 'commercial property'],
-            'Agriculture': ['crop', 'farming', 'agricultural', 'livestock', 'food production'],
-            'Marine': ['shipping', 'port', 'marine', 'coastal', 'ocean', 'sea level'],
-            'Energy': ['power plant', 'renewable energy', 'oil', 'gas', 'energy infrastructure'],
-            'Health': ['health impact', 'disease', 'medical', 'healthcare', 'heat stress'],
-            'Business': ['business interruption', 'supply chain', 'operational risk', 'commercial']
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 2,
+                 scrape_deadline: Optional[float] = None, request_timeout: float = 10,
+                 cache_dir: Optional[str] = None, cache_ttl: float = 6 * 3600,
+                 max_page_bytes: Optional[int] = 4 * 1024 * 1024,
+                 max_text_chars: Optional[int] = None,
+                 queries: Optional[List[str]] = None, news_api_url: str = NEWS_API_URL,
+                 max_pages: int = 5, max_api_requests: Optional[int] = 50,
+                 metrics: Optional[Metrics] = None,
+                 dedup_distance: Optional[int] = DEFAULT_MAX_DISTANCE,
+                 taxonomy_file: Optional[str] = None, domain_stats_file: Optional[str] = None,
+                 parse_processes: int = 0):
+        # Timers and counters for every pipeline stage; NullMetrics makes them no-ops
+        self.metrics = metrics or NullMetrics()
+
+        # Scraping concurrency: max_workers=1 scrapes serially; scrape_deadline
+        # (seconds) bounds the whole scraping phase of a run
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.scrape_deadline = scrape_deadline
+        self.request_timeout = request_timeout
+
+        # With parse_processes > 0, scraper threads only download pages and a pool of
+        # that many processes extracts and scores them, so parsing uses every core
+        self.parse_processes = max(0, parse_processes)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
+
+        # Article pages are read as a stream and abandoned after max_page_bytes;
+        # max_text_chars optionally stops once that much article text is collected
+        self.max_page_bytes = max_page_bytes
+        self.max_text_chars = max_text_chars
+
+        # Syndicated copies within dedup_distance SimHash bits of an earlier article
+        # are attached to it instead of being scraped and scored; None disables this
+        self.dedup_distance = dedup_distance
+
+        # Extracted article text is cached on disk between runs when cache_dir is set
+        self.cache = ScrapeCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+
+        # Per-host latency and outcome history for adaptive timeouts, the circuit
+        # breaker and the skip list; persisted next to the scrape cache by default
+        if domain_stats_file is None and cache_dir:
+            domain_stats_file = os.path.join(cache_dir, 'domain_stats.json')
+        self.domain_stats = DomainStats(domain_stats_file)
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_workers,
+                                                pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+        # NewsAPI search: each query variant is paged through over the pooled session
+        self.queries = queries or [DEFAULT_QUERY]
+        self.news_fetcher = NewsAPIFetcher(NEWS_API_KEY, session=self.session,
+                                           base_url=news_api_url, max_pages=max_pages,
+                                           max_requests=max_api_requests, metrics=self.metrics)
+
+        # Keywords and weights come from a versioned taxonomy file rather than code,
+        # so history can be rescored offline when they change (see rescore.py)
+        taxonomy = load_taxonomy(taxonomy_file or os.getenv('TAXONOMY_FILE'))
+        self.taxonomy_version = taxonomy['version']
+        self.risk_levels = taxonomy['risk_levels']
+        self.risk_indicators = taxonomy['risk_indicators']
+        self.insurance_sectors = taxonomy['insurance_sectors']
+        self.impact_areas = taxonomy['impact_areas']
+
+        # Compiled once per agent and shared by all scoring methods
+        self.matcher = KeywordMatcher(self.taxonomy_keywords())
+
+        # Set by incremental runs and persisted next to the corpus by save_analysis
+        self.ingest_state: Optional[Dict] = None
+        # Articles analyzed by the latest run only, e.g. for appending to a ResultStore
+        self.last_run_articles: List[Dict] = []
+        # Syndicated copies found by the latest run of articles from earlier runs, by URL
+        self.last_run_syndicated: Dict[str, List[Dict]] = {}
+        # Text each article of the latest run was scored on, by URL, for rescoring later
+        self.last_run_texts: Dict[str, str] = {}
+
+    @property
+    def taxonomy(self) -> Dict:
+        """Return the scoring taxonomy as plain data, e.g. for worker processes"""
+        return {
+            'version': self.taxonomy_version,
+            'risk_levels': self.risk_levels,
+            'risk_indicators': self.risk_indicators,
+            'insurance_sectors': self.insurance_sectors,
+            'impact_areas': self.impact_areas
         }
 
+    def taxonomy_keywords(self) -> List[str]:
+        """Return every keyword used by the risk, sector and impact taxonomies"""
+        keywords = []
+        for sector_keywords in self.insurance_sectors.values():
+            keywords.extend(sector_keywords)
+        for indicators in self.risk_indicators.values():
+            keywords.extend(indicators['keywords'])
+            keywords.extend(indicators['numerical_indicators'])
+            keywords.extend(indicators['temporal_indicators'])
+        for area_keywords in self.impact_areas.values():
+            keywords.extend(area_keywords)
+        return keywords
+
     def clean_text(self, text: str) -> str:
         """Clean and normalize text content"""
-        if not text:
-            return ""
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return clean_text(text)
 
-    def get_article_content(self, url: str) -> str:
+    def get_article_content(self, url: str, timeout: Optional[float] = None) -> str:
         """Get full content from article URL"""
+        host = urlparse(url).netloc.lower()
+        start = time.perf_counter()
+        host_timeout, deadline_bound = self._host_timeout(host, timeout)
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for tag in ['script', 'style', 'nav', 'header', 'footer', 'aside']:
-                for element in soup.find_all(tag):
-                    element.decompose()
-            
-            content = soup.find('article') or soup.find('main') or soup.find('body')
-            return self.clean_text(content.get_text()) if content else ""
+            early, headers, cached = self._prepare_request(url, host)
+            if early is not None:
+                return early
+
+            stats = {}
+            with self.session.get(url, headers=headers, stream=True, timeout=host_timeout) as response:
+                if cached and response.status_code == 304:
+                    self.cache.mark_revalidated(url)
+                    self._record_scrape(host, time.perf_counter() - start, 'revalidated',
+                                        chars=len(cached['text']), host_stats=not deadline_bound)
+                    return cached['text']
+
+                text = self.clean_text(extract_response_text(
+                    response, max_bytes=self.max_page_bytes, max_text_chars=self.max_text_chars,
+                    stats=stats))
+
+            self._finish_download(url, host, time.perf_counter() - start, response, text, stats,
+                                  host_stats=not deadline_bound)
+            return text
         except Exception as e:
-            print(f"Error scraping content: {str(e)}")
+            logger.warning("Error scraping %s: %s", url, e)
+            self._record_scrape(host, time.perf_counter() - start, 'failed', self._failure_reason(e),
+                                host_stats=not deadline_bound)
             return ""
 
+    def download_page(self, url: str, timeout: Optional[float] = None) -> Dict:
+        """Download a page's raw bytes without parsing them, for the process-pool CPU stage.
+
+        Returns ``{'text': ...}`` when no parsing is needed (cache hit, skipped
+        publisher, not modified, error). Otherwise returns the undecoded body,
+        read into one growing buffer up to ``max_page_bytes``, as ``data``
+        along with its ``encoding`` and what ``record_parsed_page`` needs once
+        the text is extracted.
+        """
+        host = urlparse(url).netloc.lower()
+        start = time.perf_counter()
+        host_timeout, deadline_bound = self._host_timeout(host, timeout)
+        try:
+            early, headers, cached = self._prepare_request(url, host)
+            if early is not None:
+                return {'text': early}
+
+            data = bytearray()
+            with self.session.get(url, headers=headers, stream=True, timeout=host_timeout) as response:
+                if cached and response.status_code == 304:
+                    self.cache.mark_revalidated(url)
+                    self._record_scrape(host, time.perf_counter() - start, 'revalidated',
+                                        chars=len(cached['text']), host_stats=not deadline_bound)
+                    return {'text': cached['text']}
+
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if content_type and content_type not in HTML_CONTENT_TYPES:
+                    self._finish_download(url, host, time.perf_counter() - start, response, "", {},
+                                          host_stats=not deadline_bound)
+                    return {'text': ""}
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    if self.max_page_bytes is not None and len(data) + len(chunk) >= self.max_page_bytes:
+                        data += chunk[:self.max_page_bytes - len(data)]
+                        break
+                    data += chunk
+
+            return {'data': data, 'encoding': response.encoding or 'utf-8', 'url': url, 'host': host,
+                    'seconds': time.perf_counter() - start, 'response': response,
+                    'host_stats': not deadline_bound}
+        except Exception as e:
+            logger.warning("Error scraping %s: %s", url, e)
+            self._record_scrape(host, time.perf_counter() - start, 'failed', self._failure_reason(e),
+                                host_stats=not deadline_bound)
+            return {'text': ""}
+
+    def record_parsed_page(self, page: Dict, text: str):
+        """Record the outcome of a page from ``download_page`` once its text is extracted"""
+        self._finish_download(page['url'], page['host'], page['seconds'], page['response'], text,
+                              {'bytes': len(page['data'])}, host_stats=page['host_stats'])
+
+    def _prepare_request(self, url: str, host: str) -> Tuple[Optional[str], Dict, Optional[Dict]]:
+        """Return (text to use without a request, request headers, cache entry) for a URL"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        cached = self.cache.get(url) if self.cache else None
+        if cached:
+            if cached['fresh']:
+                self.metrics.inc('scrape_results_total', result='cache_hit')
+                return cached['text'], headers, cached
+            headers.update(ScrapeCache.conditional_headers(cached))
+
+        # Publishers that keep failing or never yield text are not requested;
+        # the article is then scored on its NewsAPI content or description
+        skip_reason = self.domain_stats.skip_reason(host)
+        if skip_reason:
+            self.metrics.inc('scrape_results_total', result='skipped')
+            self.metrics.inc('scrape_skipped_total', reason=skip_reason)
+            return (cached['text'] if cached else ""), headers, cached
+        return None, headers, cached
+
+    def _host_timeout(self, host: str, timeout: Optional[float]) -> Tuple[float, bool]:
+        """Return the request timeout for a host, and whether the caller's shorter timeout,
+        i.e. the time left before the run deadline, set it instead of the host's own"""
+        host_timeout = self.domain_stats.timeout(host, self.request_timeout)
+        if timeout is not None and timeout < host_timeout:
+            return timeout, True
+        return host_timeout, False
+
+    def _finish_download(self, url: str, host: str, seconds: float, response: requests.Response,
+                         text: str, stats: Dict, host_stats: bool = True):
+        """Record a completed download and cache its extracted text"""
+        self.metrics.inc('scrape_bytes_total', stats.get('bytes', 0), host=host)
+        if not response.ok:
+            self._record_scrape(host, seconds, 'failed', f'http_{response.status_code // 100}xx',
+                                host_stats=host_stats)
+        elif not text:
+            self._record_scrape(host, seconds, 'failed', 'no_text' if stats else 'not_html',
+                                host_stats=host_stats)
+        else:
+            self._record_scrape(host, seconds, 'fetched', chars=len(text), host_stats=host_stats)
+
+        if self.cache and response.ok:
+            self.cache.put(url, text, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'))
+
+    def _record_scrape(self, host: str, seconds: float, result: str, reason: Optional[str] = None,
+                       chars: int = 0, host_stats: bool = True):
+        """Record the latency and outcome of one article download.
+
+        With ``host_stats=False`` the outcome says nothing about the publisher,
+        e.g. when the run deadline cut the request's timeout short, so it is
+        left out of the per-host statistics and any trial it stood for is re-armed.
+        """
+        self.metrics.observe('scrape_seconds', seconds, host=host)
+        self.metrics.inc('scrape_results_total', result=result)
+        if reason:
+            self.metrics.inc('scrape_failures_total', reason=reason)
+        if host_stats:
+            # Pages without text count against the host's yield, not as failures
+            self.domain_stats.record(host, seconds,
+                                     failed=bool(reason) and reason not in ('no_text', 'not_html'),
+                                     chars=chars)
+        else:
+            # If this was the host's circuit trial or text probe, the next request takes its place
+            self.domain_stats.rearm(host)
+
+    @staticmethod
+    def _failure_reason(error: Exception) -> str:
+        """Classify a scraping exception into a low-cardinality failure reason"""
+        if isinstance(error, requests.Timeout):
+            return 'timeout'
+        if isinstance(error, requests.exceptions.SSLError):
+            return 'ssl'
+        if isinstance(error, requests.ConnectionError):
+            return 'connection'
+        if isinstance(error, requests.RequestException):
+            return 'request'
+        return 'parse'
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        """Return the semaphore limiting concurrent requests to the URL's host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _scrape_before_deadline(self, url: str, deadline: Optional[float]) -> str:
+        """Scrape a single URL unless the run deadline has already passed"""
+        timeout = self._timeout_before(deadline)
+        if timeout is None:
+            return ""
+        return self.get_article_content(url, timeout=timeout)
+
+    def _download_before_deadline(self, article: Dict, deadline: Optional[float]) -> Dict:
+        """Download an article page unless the run deadline has already passed"""
+        timeout = self._timeout_before(deadline)
+        if timeout is None:
+            return {'text': ""}
+        return self.download_page(article['url'], timeout=timeout)
+
+    def _parse_downloaded(self, article: Dict, page: Dict) -> Tuple[str, Optional[Dict]]:
+        """Extract and score a page from ``_download_before_deadline`` in the parse pool.
+
+        Once the pool is broken, e.g. because a worker was killed, the rest of
+        the run parses in the scraper threads and leaves scoring to the
+        caller; the next run starts a new pool.
+        """
+        from parse_pool import extract_text, parse_and_score
+
+        # Never started here: a run that lost its pool parses in its threads until the next run
+        pool = self._parse_pool
+        try:
+            with self.metrics.timer('parse_seconds'):
+                if pool is None:
+                    raise BrokenProcessPool("parse pool is not running")
+                text, scores = pool.submit(
+                    parse_and_score, self.scoring_text(article), page.get('data'),
+                    page.get('encoding', 'utf-8'), page.get('text', ""), self.max_text_chars).result()
+        except BrokenProcessPool as e:
+            if pool is not None:
+                logger.warning("Parse pool broke (%s); parsing in scraper threads until the next run", e)
+                self._discard_parse_pool(pool)
+            if 'data' not in page:
+                return page.get('text', ""), None
+            try:
+                text, scores = extract_text(page['data'], page['encoding'], self.max_text_chars), None
+            except Exception as e:
+                return self._parse_failed(article, page, e)
+        except Exception as e:
+            return self._parse_failed(article, page, e)
+        if 'data' in page:
+            self.record_parsed_page(page, text)
+        return text, scores
+
+    def _parse_failed(self, article: Dict, page: Dict, error: Exception) -> Tuple[str, None]:
+        logger.warning("Error parsing %s: %s", article['url'], error)
+        if 'data' in page:
+            # A local parsing problem says nothing about the publisher
+            self._record_scrape(page['host'], page['seconds'], 'failed', 'parse', host_stats=False)
+        return "", None
+
+    def _timeout_before(self, deadline: Optional[float]) -> Optional[float]:
+        """Return the request timeout left before the deadline, or None once it has passed"""
+        timeout = self.request_timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.metrics.inc('scrape_failures_total', reason='deadline')
+                return None
+            timeout = min(timeout, remaining)
+        return timeout
+
+    @property
+    def parse_pool(self) -> ProcessPoolExecutor:
+        """Worker processes that extract and score downloaded pages, started on first use"""
+        from parse_pool import init_worker
+
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # Workers are never forked from this process: concurrent backfill chunks and
+                # scraper threads abandoned at a deadline may be running when a pool starts
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_processes,
+                                                       mp_context=parse_pool_context(),
+                                                       initializer=init_worker, initargs=(self.taxonomy,))
+            return self._parse_pool
+
+    def _start_parse_pool(self):
+        """Make sure the parse pool's workers are running, replacing a broken pool"""
+        for _ in range(2):
+            pool = self.parse_pool
+            try:
+                pool.submit(int).result()
+                return
+            except BrokenProcessPool as e:
+                logger.warning("Parse pool is broken (%s); starting a new one", e)
+                self.metrics.inc('parse_pool_restarts_total')
+                self._discard_parse_pool(pool)
+
+    def _discard_parse_pool(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next run creates a new one"""
+        with self._parse_pool_lock:
+            if self._parse_pool is pool:
+                self._parse_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Shut down the parse pool's worker processes, if any were started"""
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(cancel_futures=True)
+                self._parse_pool = None
+
+    def iter_scraped(self, urls: List[str],
+                     buffer_size: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Scrape URLs concurrently, yielding (index, content) pairs as pages finish.
+
+        Workers block once ``buffer_size`` results are waiting, so they never
+        run further ahead of the consumer than that. When the scrape deadline
+        passes, every unfinished URL is yielded with empty content.
+        """
+        return self._iter_concurrently(urls, lambda url: url, self._scrape_before_deadline, "", buffer_size)
+
+    def iter_parsed(self, articles: List[Dict],
+                    buffer_size: Optional[int] = None) -> Iterator[Tuple[int, str, Optional[Dict]]]:
+        """Like ``iter_scraped`` for NewsAPI articles, with parsing and scoring in the parse pool.
+
+        Scraper threads only download bytes; ``parse_processes`` worker
+        processes extract the text and score it. Yields (index, content,
+        scores), where scores has the ``score_content`` shape, or is None when
+        the article still has to be scored, e.g. after the deadline passed.
+        """
+        if articles:
+            # Start the worker processes before the downloads, so their start-up
+            # never holds up the first pages
+            self._start_parse_pool()
+        # The host slot is released once a page is downloaded: parsing is CPU
+        # work and other downloads from the same host can proceed meanwhile
+        for index, (content, scores) in self._iter_concurrently(
+                articles, lambda article: article['url'], self._download_before_deadline, ("", None),
+                buffer_size, finish=self._parse_downloaded):
+            yield index, content, scores
+
+    def _iter_concurrently(self, items: List, url_of: Callable[[Any], str], work: Callable, default,
+                           buffer_size: Optional[int] = None,
+                           finish: Optional[Callable] = None) -> Iterator[Tuple[int, Any]]:
+        """Run work(item, deadline) on scraper threads, yielding (index, result) as items finish.
+
+        Each call holds a slot of its URL's host. An idle thread takes the
+        first pending item whose host has a free slot, so a run of URLs from
+        one publisher never parks threads that could serve other hosts. With
+        ``finish``, the result is finish(item, work_result), computed after
+        the host slot is released.
+        """
+        finish = finish or (lambda item, result: result)
+        deadline = time.monotonic() + self.scrape_deadline if self.scrape_deadline else None
+        if self.max_workers == 1:
+            for index, item in enumerate(items):
+                with self._host_slot(url_of(item)):
+                    result = work(item, deadline)
+                yield index, finish(item, result)
+            return
+        if not items:
+            return
+
+        results = queue.Queue(maxsize=buffer_size or 2 * self.max_workers)
+        stop = threading.Event()
+        pending = list(enumerate(items))
+        # Notified whenever a host slot is released
+        slot_freed = threading.Condition()
+
+        def take() -> Optional[Tuple[int, Any, threading.Semaphore]]:
+            with slot_freed:
+                while pending and not stop.is_set():
+                    saturated = set()
+                    for position, (index, item) in enumerate(pending):
+                        url = url_of(item)
+                        host = urlparse(url).netloc.lower()
+                        if host in saturated:
+                            continue
+                        slot = self._host_slot(url)
+                        if slot.acquire(blocking=False):
+                            del pending[position]
+                            return index, item, slot
+                        saturated.add(host)
+                    # Every pending host is busy; slots held by other runs sharing
+                    # this agent are released without a notification, hence the timeout
+                    slot_freed.wait(timeout=0.05)
+                return None
+
+        def run():
+            while not stop.is_set():
+                entry = take()
+                if entry is None:
+                    return
+                index, item, slot = entry
+                try:
+                    try:
+                        result = work(item, deadline)
+                    finally:
+                        slot.release()
+                        with slot_freed:
+                            slot_freed.notify_all()
+                    result = finish(item, result)
+                except Exception:
+                    result = default
+                while not stop.is_set():
+                    try:
+                        results.put((index, result), timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+
+        for _ in range(min(self.max_workers, len(items))):
+            threading.Thread(target=run, name='scraper', daemon=True).start()
+
+        unfinished = set(range(len(items)))
+        try:
+            while unfinished:
+                timeout = max(0, deadline - time.monotonic()) if deadline is not None else None
+                try:
+                    index, result = results.get(timeout=timeout)
+                except queue.Empty:
+                    logger.warning("Scrape deadline reached, skipping %d articles", len(unfinished))
+                    self.metrics.inc('scrape_failures_total', len(unfinished), reason='deadline')
+                    stop.set()
+                    for index in sorted(unfinished):
+                        yield index, default
+                    return
+                unfinished.discard(index)
+                yield index, result
+        finally:
+            # Also reached when the consumer stops early: idle workers exit
+            stop.set()
+
     def assess_risk_level(self, text: str) -> Dict:
         """Enhanced risk level assessment with sentiment and numerical analysis"""
-        text = text.lower()
-        
-        # Enhanced risk indicators with weights
-        risk_indicators = {
-            'HIGH': {
-                'keywords': ['severe', 'catastrophic', 'extreme', 'critical', 'urgent'],
-                'weight': 3,
-                'numerical_indicators': ['million', 'billion', 'thousands', 'massive', 'huge'],
-                'temporal_indicators': ['immediate', 'urgent', 'now', 'critical']
-            },
-            'MEDIUM': {
-                'keywords': ['moderate', 'potential', 'concerning', 'challenge'],
-                'weight': 2,
-                'numerical_indicators': ['hundreds', 'significant', 'substantial'],
-                'temporal_indicators': ['ongoing', 'developing', 'growing']
-            },
-            'LOW': {
-                'keywords': ['minor', 'minimal', 'small', 'limited'],
-                'weight': 1,
-                'numerical_indicators': ['small', 'minor', 'limited'],
-                'temporal_indicators': ['future', 'potential', 'long-term']
-            }
+        return self._assess_risk_from_matches(self.matcher.scan(text))
+
+    def identify_affected_sectors(self, text: str) -> List[str]:
+        """Identify insurance sectors affected by the risk"""
+        return self._sectors_from_matches(self.matcher.scan(text))
+
+    def analyze_impact(self, text: str) -> Dict:
+        """Analyze potential impact on insurance business"""
+        return self._impact_from_matches(self.matcher.scan(text))
+
+    def score_content(self, text: str) -> Dict:
+        """Run risk, sector and impact scoring from a single keyword scan"""
+        metrics = self.metrics
+        with metrics.timer('scoring_seconds', method='scan'):
+            found = self.matcher.scan(text)
+        with metrics.timer('scoring_seconds', method='risk'):
+            risk_assessment = self._assess_risk_from_matches(found)
+        with metrics.timer('scoring_seconds', method='sectors'):
+            affected_sectors = self._sectors_from_matches(found)
+        with metrics.timer('scoring_seconds', method='impact'):
+            impact_analysis = self._impact_from_matches(found)
+        return {
+            'risk_assessment': risk_assessment,
+            'affected_sectors': affected_sectors,
+            'impact_analysis': impact_analysis
         }
+
+    def analyze_batch(self, texts: List[str], processes: Optional[int] = None,
+                      shard_size: int = 2000) -> List[Dict]:
+        """Score many texts in one vectorized pass, optionally sharded over processes.
+
+        Each result has the same shape as ``score_content`` and matches it exactly.
+        Only sharding makes it faster than scoring text by text, so pass
+        ``processes`` on multi-core hosts.
+        """
+        from batch_scoring import BatchScorer, score_in_processes
+
+        with self.metrics.timer('scoring_seconds', method='batch'):
+            if processes and processes > 1 and len(texts) > shard_size:
+                return score_in_processes(self.taxonomy, texts, processes, shard_size)
+            return BatchScorer(self.taxonomy).score(texts)
+
+    def _assess_risk_from_matches(self, found: FrozenSet[str]) -> Dict:
+        """Weigh the matched risk indicators into a risk level and confidence"""
+        risk_scores = {level: 0 for level in self.risk_indicators.keys()}
         
-        risk_scores = {level: 0 for level in risk_indicators.keys()}
-        
-        for level, indicators in risk_indicators.items():
+        for level, indicators in self.risk_indicators.items():
             # Keyword matching
-            keyword_score = sum(1 for keyword in indicators['keywords'] if keyword in text)
+            keyword_score = KeywordMatcher.count(found, indicators['keywords'])
             
             # Numerical indicator matching
-            numerical_score = sum(1 for indicator in indicators['numerical_indicators'] if indicator in text)
+            numerical_score = KeywordMatcher.count(found, indicators['numerical_indicators'])
             
             # Temporal context matching
-            temporal_score = sum(1 for indicator in indicators['temporal_indicators'] if indicator in text)
+            temporal_score = KeywordMatcher.count(found, indicators['temporal_indicators'])
             
             # Calculate weighted score
             risk_scores[level] = (
@@ -118,43 +625,18 @@ class InsuranceClimateAgent:
             'details': risk_scores
         }
 
-    def identify_affected_sectors(self, text: str) -> List[str]:
-        """Identify insurance sectors affected by the risk"""
-        text = text.lower()
-        affected_sectors = []
-        
-        for sector, keywords in self.insurance_sectors.items():
-            if any(keyword in text for keyword in keywords):
-                affected_sectors.append(sector)
-        
-        return affected_sectors
+    def _sectors_from_matches(self, found: FrozenSet[str]) -> List[str]:
+        """List the sectors with at least one matched keyword"""
+        return [
+            sector for sector, keywords in self.insurance_sectors.items()
+            if any(keyword in found for keyword in keywords)
+        ]
 
-    def analyze_impact(self, text: str) -> Dict:
-        """Analyze potential impact on insurance business"""
-        text = text.lower()
-        
-        impact_areas = {
-            'Financial': [
-                'loss', 'cost', 'premium', 'payment', 'claim', 'financial',
-                'revenue', 'profit', 'market', 'investment'
-            ],
-            'Operational': [
-                'operation', 'process', 'service', 'business interruption',
-                'workflow', 'management', 'infrastructure'
-            ],
-            'Regulatory': [
-                'regulation', 'compliance', 'policy', 'requirement', 'law',
-                'standard', 'guideline', 'framework'
-            ],
-            'Reputational': [
-                'reputation', 'brand', 'customer', 'public', 'trust',
-                'confidence', 'relationship'
-            ]
-        }
-        
+    def _impact_from_matches(self, found: FrozenSet[str]) -> Dict:
+        """Grade each impact area by its number of matched keywords"""
         impacts = {}
-        for area, keywords in impact_areas.items():
-            matches = sum(1 for keyword in keywords if keyword in text)
+        for area, keywords in self.impact_areas.items():
+            matches = KeywordMatcher.count(found, keywords)
             impacts[area] = {
                 'level': 'HIGH' if matches >= 3 else 'MEDIUM' if matches >= 1 else 'LOW',
                 'matches': matches
@@ -162,120 +644,447 @@ class InsuranceClimateAgent:
         
         return impacts
 
-    def get_insurance_climate_news(self) -> Dict:
-        """Fetch and analyze climate news relevant to insurance"""
-        base_url = "https://newsapi.org/v2/everything"
-        
-        # Get news from last 7 days
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-        
-        # Search parameters focused on insurance and climate risk
+    @staticmethod
+    def scoring_text(article: Dict, full_content: str = "") -> str:
+        """Return the text an article is scored on: its NewsAPI content plus the scraped page"""
+        content = article.get('content', '') or article.get('description', '')
+        if full_content:
+            content = f"{content} {full_content}"
+        return content
+
+    def analyze_article(self, article: Dict, full_content: str = "",
+                        syndicated_sources: Optional[List[Dict]] = None,
+                        scores: Optional[Dict] = None) -> Optional[Dict]:
+        """Analyze a NewsAPI article, returning None if it has no insurance relevance.
+
+        ``scores`` may hold the ``score_content`` result computed elsewhere,
+        e.g. by the parse pool, so the content is not scored again.
+        """
+        content = self.scoring_text(article, full_content)
+
+        # Analyze the content
+        scores = scores or self.score_content(content)
+        risk_assessment = scores['risk_assessment']
+        affected_sectors = scores['affected_sectors']
+        impact_analysis = scores['impact_analysis']
+
+        # Only include articles with clear insurance relevance
+        if not affected_sectors and risk_assessment['level'] == 'UNDEFINED':
+            return None
+
+        return {
+            'title': article['title'],
+            'source': article['source']['name'],
+            'url': article['url'],
+            'date': article['publishedAt'],
+            'risk_assessment': risk_assessment,
+            'affected_sectors': affected_sectors,
+            'impact_analysis': impact_analysis,
+            'preview': self.clean_text(content)[:300] + "...",
+            'syndicated_sources': syndicated_sources or []
+        }
+
+    @staticmethod
+    def syndicated_source(article: Dict) -> Dict:
+        """Summarize a NewsAPI article folded into another as a syndicated copy"""
+        return {
+            'title': article['title'],
+            'source': article['source']['name'],
+            'url': article['url'],
+            'date': article['publishedAt']
+        }
+
+    def cluster_syndicated(self, articles: List[Dict], state: Dict) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+        """Group near-duplicate articles before they are scraped.
+
+        Returns the first article of each story, in input order, and the other
+        copies keyed by that article's URL. Copies of stories fingerprinted by
+        earlier incremental runs (``state['fingerprints']``) are keyed by the
+        earlier article's URL. New fingerprints are added to the state.
+        """
+        if self.dedup_distance is None:
+            return articles, {}
+
+        index = NearDuplicateIndex(self.dedup_distance)
+        fingerprints = state['fingerprints']
+        for url, (fingerprint, _) in fingerprints.items():
+            index.add(url, int(fingerprint, 16))
+
+        representatives, syndicated = [], {}
+        for article in articles:
+            fingerprint = article_fingerprint(article)
+            key = index.find(fingerprint) if fingerprint is not None else None
+            if key is None:
+                representatives.append(article)
+                if fingerprint is not None:
+                    index.add(article['url'], fingerprint)
+                    fingerprints[article['url']] = [format(fingerprint, '016x'), article['publishedAt']]
+            else:
+                syndicated.setdefault(key, []).append(self.syndicated_source(article))
+        return representatives, syndicated
+
+    def iter_insurance_climate_news(self, incremental: bool = False,
+                                    corpus_file: str = "insurance_climate_analysis.json",
+                                    ordered: bool = False, buffer_size: Optional[int] = None,
+                                    previous: Optional[Dict] = None,
+                                    start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                    budget: Optional[RequestBudget] = None,
+                                    known_urls: Optional[Callable[[List[str]], Set[str]]] = None,
+                                    texts: Optional[Dict[str, str]] = None) -> Iterator[Dict]:
+        """Yield analyzed climate news articles as soon as each one is scraped and scored.
+
+        Articles come out in completion order, or in NewsAPI order with
+        ``ordered``. At most ``buffer_size`` scraped pages wait between the
+        scraping and scoring stages, so memory stays bounded however many
+        articles a run covers and a slow consumer pauses the scrapers. Raises
+        NewsAPIError if the search fails. An incremental run updates
+        ``ingest_state`` only once the generator is exhausted.
+
+        The search covers ``start_date`` to ``end_date`` inclusive, by default
+        the last 7 days. NewsAPI requests count against ``budget`` when given,
+        and ``known_urls`` may return the fetched URLs that are already stored
+        elsewhere so they are not scraped again. If ``texts`` is given, the text
+        each yielded article was scored on is added to it by URL.
+        """
+        run_start = time.perf_counter()
+        params, state = self._search_params(incremental, corpus_file, previous, start_date, end_date)
+
+        logger.info("Fetching insurance-relevant climate news...")
+        with self.metrics.timer('stage_seconds', stage='fetch'):
+            articles = self.news_fetcher.fetch(self.queries, params, budget)
+        logger.info("Found %d articles", len(articles))
+
+        # Skip repeated and already processed URLs, keeping the first occurrence of each
+        unique_articles = []
+        processed_urls = set(state['processed_urls'])
+        if known_urls:
+            processed_urls.update(known_urls([article['url'] for article in articles]))
+        for article in articles:
+            if article['url'] in processed_urls:
+                continue
+            processed_urls.add(article['url'])
+            unique_articles.append(article)
+        if incremental:
+            logger.info("%d new articles since the last run", len(unique_articles))
+
+        # Only one copy of each syndicated story is scraped and scored
+        representatives, syndicated = self.cluster_syndicated(unique_articles, state)
+        representative_urls = {article['url'] for article in representatives}
+        self.last_run_syndicated = {
+            url: sources for url, sources in syndicated.items() if url not in representative_urls
+        }
+        duplicates = len(unique_articles) - len(representatives)
+        if duplicates:
+            logger.info("%d syndicated copies folded into %d stories", duplicates, len(syndicated))
+
+        relevant = 0
+        next_index, pending = 0, {}
+        stream_start = time.perf_counter()
+        if self.parse_processes:
+            scraped = self.iter_parsed(representatives, buffer_size)
+        else:
+            scraped = ((index, content, None) for index, content in
+                       self.iter_scraped([article['url'] for article in representatives], buffer_size))
+        for index, full_content, scores in scraped:
+            article = representatives[index]
+            analyzed_article = self.analyze_article(article, full_content, syndicated.get(article['url']),
+                                                    scores)
+            if analyzed_article and texts is not None:
+                texts[article['url']] = self.scoring_text(article, full_content)
+            if ordered:
+                # Hold early finishers back until every earlier article is out
+                pending[index] = analyzed_article
+                ready = []
+                while next_index in pending:
+                    ready.append(pending.pop(next_index))
+                    next_index += 1
+            else:
+                ready = [analyzed_article]
+            for analyzed_article in ready:
+                if analyzed_article:
+                    if not relevant:
+                        self.metrics.observe('first_result_seconds', time.perf_counter() - run_start)
+                    relevant += 1
+                    yield analyzed_article
+        self.metrics.observe('stage_seconds', time.perf_counter() - stream_start, stage='scrape_analyze')
+
+        if self.cache:
+            stats = self.cache.stats
+            logger.info("Scrape cache: %d hits, %d revalidated, %d fetched", stats['hits'],
+                        stats['revalidated'], stats['misses'] + stats['refetched'])
+        self.domain_stats.save()
+
+        self.metrics.inc('articles_total', len(articles), stage='fetched')
+        self.metrics.inc('articles_total', len(unique_articles), stage='new')
+        self.metrics.inc('articles_total', duplicates, stage='syndicated')
+        self.metrics.inc('articles_total', relevant, stage='relevant')
+        self.metrics.inc('runs_total', result='ok')
+        self.metrics.event('run_complete', fetched=len(articles), new=len(unique_articles),
+                           syndicated=duplicates, relevant=relevant, incremental=incremental)
+
+        if incremental:
+            for article in unique_articles:
+                state['processed_urls'][article['url']] = article['publishedAt']
+                if not state['high_water_mark'] or article['publishedAt'] > state['high_water_mark']:
+                    state['high_water_mark'] = article['publishedAt']
+            self.ingest_state = state
+
+    def _search_params(self, incremental: bool, corpus_file: str,
+                       previous: Optional[Dict] = None, start_date: Optional[date] = None,
+                       end_date: Optional[date] = None) -> Tuple[Dict, Dict]:
+        """Return the NewsAPI search parameters and ingest state for a run"""
+        # Get news from last 7 days unless a window is given
+        end_date = end_date or datetime.now()
+        start_date = start_date or end_date - timedelta(days=7)
+
+        state = {'high_water_mark': None, 'processed_urls': {}, 'fingerprints': {}}
+        if incremental:
+            if previous is None:
+                previous = self.load_analysis(corpus_file)
+            state = self.load_ingest_state(corpus_file)
+            # URLs fall out of the search window after 7 days, so stop tracking them
+            window_start = start_date.strftime('%Y-%m-%d')
+            state['processed_urls'] = {
+                url: published for url, published in state['processed_urls'].items()
+                if published >= window_start
+            }
+            state['fingerprints'] = {
+                url: entry for url, entry in state['fingerprints'].items()
+                if entry[1] >= window_start
+            }
+            for articles in previous.values():
+                for article in articles:
+                    state['processed_urls'].setdefault(article['url'], article['date'])
+
+        # Search parameters shared by every query
         params = {
-            'apiKey': NEWS_API_KEY,
-            'q': '(climate risk OR climate change OR natural disaster) AND (insurance OR reinsurance OR risk assessment)',
             'language': 'en',
             'from': start_date.strftime('%Y-%m-%d'),
             'to': end_date.strftime('%Y-%m-%d'),
-            'sortBy': 'relevancy',
-            'pageSize': 100
+            'sortBy': 'relevancy'
         }
-        
+        # Only ask for articles published since shortly before the last run's newest
+        # article. NewsAPI indexes some articles late, and relevancy sorting, the page
+        # cap or the request budget can leave older ones unfetched; the overlap catches
+        # them, and processed_urls drops the ones already seen.
+        if state['high_water_mark']:
+            newest = datetime.fromisoformat(state['high_water_mark'].replace('Z', '+00:00'))
+            since = (newest - HIGH_WATER_MARK_OVERLAP).strftime('%Y-%m-%dT%H:%M:%S')
+            if since > params['from']:
+                params['from'] = since
+        return params, state
+
+    def get_insurance_climate_news(self, incremental: bool = False,
+                                   corpus_file: str = "insurance_climate_analysis.json",
+                                   report: bool = True, start_date: Optional[date] = None,
+                                   end_date: Optional[date] = None) -> Dict:
+        """Fetch and analyze climate news relevant to insurance.
+
+        In incremental mode the corpus previously saved to ``corpus_file`` is
+        loaded, URLs it already processed are neither scraped nor scored, and the
+        new articles are merged into its risk-level buckets. The updated ingest
+        state is written by ``save_analysis``. ``report=False`` skips printing
+        the console report. ``start_date`` and ``end_date`` override the
+        default 7-day search window.
+        """
+        # Cleared first, so a failed run never leaves the previous run's articles to store again
+        self.last_run_articles = []
+        self.last_run_texts = {}
+        previous = self.load_analysis(corpus_file) if incremental else {}
+        texts = {}
         try:
-            print("Fetching insurance-relevant climate news...")
-            response = requests.get(base_url, params=params)
-            response.raise_for_status()
-            news_data = response.json()
-            
-            if news_data.get('status') != 'ok':
-                print(f"Error from NewsAPI: {news_data.get('message', 'Unknown error')}")
-                return {}
-            
-            articles = news_data.get('articles', [])
-            print(f"Found {len(articles)} articles")
-            
-            analyzed_articles = []
-            processed_urls = set()
-            
-            for article in articles:
-                if article['url'] in processed_urls:
-                    continue
-                
-                # Get and combine all available content
-                content = article.get('content', '') or article.get('description', '')
-                full_content = self.get_article_content(article['url'])
-                if full_content:
-                    content = f"{content} {full_content}"
-                
-                # Analyze the content
-                risk_assessment = self.assess_risk_level(content)
-                affected_sectors = self.identify_affected_sectors(content)
-                impact_analysis = self.analyze_impact(content)
-                
-                # Only include articles with clear insurance relevance
-                if affected_sectors or risk_assessment['level'] != 'UNDEFINED':
-                    analyzed_article = {
-                        'title': article['title'],
-                        'source': article['source']['name'],
-                        'url': article['url'],
-                        'date': article['publishedAt'],
-                        'risk_assessment': risk_assessment,
-                        'affected_sectors': affected_sectors,
-                        'impact_analysis': impact_analysis,
-                        'preview': self.clean_text(content)[:300] + "..."
-                    }
-                    analyzed_articles.append(analyzed_article)
-                
-                processed_urls.add(article['url'])
-            
+            try:
+                analyzed_articles = list(self.iter_insurance_climate_news(
+                    incremental, corpus_file, ordered=True, previous=previous,
+                    start_date=start_date, end_date=end_date, texts=texts))
+            except NewsAPIError as e:
+                logger.error("Error from NewsAPI: %s", e)
+                self.metrics.inc('runs_total', result='newsapi_error')
+                return previous
+
+            self.last_run_articles = analyzed_articles
+            self.last_run_texts = texts
+
             # Group articles by risk level
             risk_categorized = defaultdict(list)
             for article in analyzed_articles:
                 risk_level = article['risk_assessment']['level']
                 risk_categorized[risk_level].append(article)
             
-            # Print analysis results
-            print("\nInsurance Climate Risk Analysis:")
-            print("=" * 80)
-            
-            for risk_level in ['HIGH', 'MEDIUM', 'LOW', 'UNDEFINED']:
-                if risk_level in risk_categorized:
-                    articles = risk_categorized[risk_level]
-                    print(f"\nRISK LEVEL: {risk_level}")
-                    print(f"Found {len(articles)} articles\n")
-                    
-                    for i, article in enumerate(articles, 1):
-                        print(f"{i}. {article['title']}")
-                        print(f"Source: {article['source']}")
-                        print(f"Date: {article['date']}")
-                        print(f"Risk Score: {article['risk_assessment']['score']}")
-                        print(f"Affected Sectors: {', '.join(article['affected_sectors'])}")
-                        print("\nImpact Analysis:")
-                        for area, impact in article['impact_analysis'].items():
-                            print(f"- {area}: {impact['level']} (matches: {impact['matches']})")
-                        print(f"\nURL: {article['url']}")
-                        print(f"Preview: {article['preview']}")
-                        print("-" * 80 + "\n")
-            
+            if report:
+                self.print_report(risk_categorized)
+
+            if incremental:
+                merged = self.merge_analysis(previous, risk_categorized)
+                # Earlier articles that gained syndicated copies are rewritten too
+                self.last_run_articles = analyzed_articles + self.attach_syndicated(
+                    merged, self.last_run_syndicated)
+                return merged
+
             return dict(risk_categorized)
                 
         except Exception as e:
-            print(f"Error analyzing news: {str(e)}")
+            logger.exception("Error analyzing news: %s", e)
+            self.metrics.inc('runs_total', result='error')
+            return previous
+
+    def print_report(self, risk_categorized: Dict):
+        """Print the analyzed articles grouped by risk level"""
+        print("\nInsurance Climate Risk Analysis:")
+        print("=" * 80)
+        
+        for risk_level in ['HIGH', 'MEDIUM', 'LOW', 'UNDEFINED']:
+            if risk_level in risk_categorized:
+                articles = risk_categorized[risk_level]
+                print(f"\nRISK LEVEL: {risk_level}")
+                print(f"Found {len(articles)} articles\n")
+                
+                for i, article in enumerate(articles, 1):
+                    print(f"{i}. {article['title']}")
+                    print(f"Source: {article['source']}")
+                    print(f"Date: {article['date']}")
+                    print(f"Risk Score: {article['risk_assessment']['score']}")
+                    print(f"Affected Sectors: {', '.join(article['affected_sectors'])}")
+                    print("\nImpact Analysis:")
+                    for area, impact in article['impact_analysis'].items():
+                        print(f"- {area}: {impact['level']} (matches: {impact['matches']})")
+                    print(f"\nURL: {article['url']}")
+                    if article.get('syndicated_sources'):
+                        print("Also published by: " + ', '.join(
+                            source['source'] for source in article['syndicated_sources']))
+                    print(f"Preview: {article['preview']}")
+                    print("-" * 80 + "\n")
+
+    @staticmethod
+    def merge_analysis(previous: Dict, new: Dict) -> Dict:
+        """Append newly analyzed articles to the risk-level buckets of a stored corpus"""
+        merged = {level: list(articles) for level, articles in previous.items()}
+        for level, articles in new.items():
+            merged.setdefault(level, []).extend(articles)
+        return merged
+
+    @staticmethod
+    def attach_syndicated(analysis: Dict, syndicated: Dict[str, List[Dict]]) -> List[Dict]:
+        """Add syndicated copies to the stored articles they belong to, returning the updated articles"""
+        updated = []
+        if not syndicated:
+            return updated
+        for articles in analysis.values():
+            for i, article in enumerate(articles):
+                sources = syndicated.get(article['url'])
+                if sources:
+                    articles[i] = dict(article, syndicated_sources=article.get('syndicated_sources', []) + sources)
+                    updated.append(articles[i])
+        return updated
+
+    def load_analysis(self, filename: str = "insurance_climate_analysis.json") -> Dict:
+        """Load previously saved analysis results, or an empty corpus if there are none"""
+        try:
+            with open(filename) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("Error loading analysis: %s", e)
             return {}
 
-    def save_analysis(self, analysis: Dict, filename: str = "insurance_climate_analysis.json"):
-        """Save the analysis results to a JSON file"""
+    @staticmethod
+    def ingest_state_file(filename: str) -> str:
+        """Return the path of the ingest state stored next to an analysis file"""
+        return os.path.splitext(filename)[0] + '.state.json'
+
+    def load_ingest_state(self, filename: str = "insurance_climate_analysis.json") -> Dict:
+        """Load the high-water mark, processed URLs and story fingerprints of previous incremental runs"""
+        state = {'high_water_mark': None, 'processed_urls': {}, 'fingerprints': {}}
+        try:
+            with open(self.ingest_state_file(filename)) as f:
+                state.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Error loading ingest state: %s", e)
+        return state
+
+    def save_analysis(self, analysis: Dict, filename: str = "insurance_climate_analysis.json") -> bool:
+        """Save the analysis results to a JSON file, plus the ingest state of an incremental run.
+
+        Each file is replaced atomically, so readers never see a partial write.
+        Returns False if saving failed.
+        """
         try:
-            with open(filename, 'w') as f:
-                json.dump(analysis, f, indent=2)
-            print(f"\nAnalysis saved to {filename}")
+            with self.metrics.timer('stage_seconds', stage='save'):
+                write_json_atomic(filename, analysis, indent=2)
+
+                # Written after the corpus so a failed save never marks articles as processed
+                if self.ingest_state is not None:
+                    write_json_atomic(self.ingest_state_file(filename), self.ingest_state)
+            logger.info("Analysis saved to %s", filename)
+            return True
         except Exception as e:
-            print(f"Error saving analysis: {str(e)}")
+            logger.error("Error saving analysis: %s", e)
+            self.metrics.inc('save_failures_total')
+            return False
+
+def parse_pool_context():
+    """Start method for parse workers: forkserver where available, else spawn"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+def write_json_atomic(filename: str, data, **dump_kwargs):
+    """Write JSON to a temporary file next to filename, then rename it into place"""
+    with atomic_write(filename) as f:
+        json.dump(data, f, **dump_kwargs)
 
 def main():
-    agent = InsuranceClimateAgent()
-    analysis = agent.get_insurance_climate_news()
-    agent.save_analysis(analysis)
+    parser = argparse.ArgumentParser(description="Insurance climate risk analysis agent")
+    parser.add_argument('--incremental', action='store_true',
+                        help="merge new articles into the saved analysis instead of rebuilding it")
+    parser.add_argument('--query', action='append', dest='queries',
+                        help="NewsAPI query to run; repeat to search several variants")
+    parser.add_argument('--output', default="insurance_climate_analysis.json",
+                        help="analysis JSON file to write (and read in incremental mode)")
+    parser.add_argument('--store', default=os.getenv('RESULT_STORE'),
+                        help="SQLite result store to append this run's articles to")
+    parser.add_argument('--json-logs', action='store_true',
+                        help="log structured JSON lines instead of plain messages")
+    parser.add_argument('--metrics-file', default=os.getenv('METRICS_FILE'),
+                        help="write run metrics to this file in Prometheus text format")
+    parser.add_argument('--metrics-json',
+                        help="write run metrics to this file as JSON")
+    parser.add_argument('--metrics-port', type=int,
+                        help="serve Prometheus metrics on this port at /metrics while running")
+    parser.add_argument('--parse-processes', type=int, default=int(os.getenv('PARSE_PROCESSES', 0)),
+                        help="processes that extract and score pages while threads download them "
+                             "(default: PARSE_PROCESSES or 0, parse in the scraper threads)")
+    args = parser.parse_args()
+
+    configure_logging(json_logs=args.json_logs)
+    collect = args.json_logs or args.metrics_file or args.metrics_json or args.metrics_port
+    metrics = Metrics() if collect else NullMetrics()
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    agent = InsuranceClimateAgent(cache_dir=os.getenv('SCRAPE_CACHE_DIR'), queries=args.queries,
+                                  metrics=metrics, parse_processes=args.parse_processes)
+    analysis = agent.get_insurance_climate_news(incremental=args.incremental, corpus_file=args.output)
+    agent.close()
+    # Stored before the ingest state is saved, so a failed append never leaves
+    # articles marked as processed that the store does not have
+    if args.store:
+        # Imported here so runs without a store skip loading it
+        from result_store import ResultStore
+
+        with metrics.timer('stage_seconds', stage='store'):
+            written = ResultStore(args.store).append(agent.last_run_articles, agent.last_run_texts,
+                                                     agent.taxonomy_version)
+        logger.info("%d articles stored in %s", written, args.store)
+    agent.save_analysis(analysis, args.output)
+
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file)
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,57 @@
+from typing import FrozenSet, Iterable, List
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerator
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Find which of a fixed set of keywords occur in a text.
+
+    Matching follows the same substring semantics as ``keyword in text.lower()``,
+    so keywords may match inside longer words and may overlap each other. The
+    matcher is built once and lowercases each document once. With pyahocorasick
+    installed the document is scanned in a single pass over an Aho-Corasick
+    automaton; otherwise every distinct keyword is searched at most once, and a
+    keyword is skipped when a shorter keyword it contains is already missing.
+    """
+
+    def __init__(self, keywords: Iterable[str], use_automaton: bool = True):
+        # Shortest first, so every keyword contained in another one is decided
+        # before the longer keyword is looked at
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword},
+                               key=lambda keyword: (len(keyword), keyword))
+        self._requires = [
+            (keyword, frozenset(other for other in self.keywords
+                                if other != keyword and other in keyword))
+            for keyword in self.keywords
+        ]
+
+        self._automaton = None
+        if use_automaton and ahocorasick is not None and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Return the set of keywords that occur in the text"""
+        if not text:
+            return frozenset()
+        text = text.lower()
+        if self._automaton is not None:
+            return frozenset({keyword for _, keyword in self._automaton.iter(text)})
+
+        found = set()
+        for keyword, required in self._requires:
+            if required and not required <= found:
+                continue
+            if keyword in text:
+                found.add(keyword)
+        return frozenset(found)
+
+    @staticmethod
+    def count(found: FrozenSet[str], keywords: List[str]) -> int:
+        """Count how many of the keywords are in a scan result"""
+        return sum(1 for keyword in keywords if keyword in found)
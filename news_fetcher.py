@@ -0,0 +1,195 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from instrumentation import Metrics, NullMetrics
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+logger = logging.getLogger(__name__)
+
+
+class NewsAPIError(Exception):
+    """NewsAPI rejected a request or kept failing after retries"""
+
+
+class RequestBudget:
+    """Thread-safe cap on the number of NewsAPI requests a run may send.
+
+    A budget with a ``parent`` also draws every request from the parent, so
+    concurrent parts of one run can share a cap while each tracks whether
+    its own requests were refused.
+    """
+
+    def __init__(self, limit: Optional[int] = None, parent: Optional['RequestBudget'] = None):
+        self.limit = limit
+        self.parent = parent
+        self.used = 0
+        # Set once a request has been refused, i.e. some results may be missing
+        self.exhausted = False
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Reserve one request, returning False once the budget is spent"""
+        with self._lock:
+            if ((self.limit is not None and self.used >= self.limit)
+                    or (self.parent is not None and not self.parent.take())):
+                self.exhausted = True
+                return False
+            self.used += 1
+            return True
+
+
+class NewsAPIFetcher:
+    """Page through NewsAPI's /v2/everything endpoint for one or more queries.
+
+    Queries run concurrently over a shared, pooled session. Every page is
+    requested with retries and exponential backoff on 429/5xx responses,
+    honouring ``Retry-After``. Each HTTP request, including retries, counts
+    against a ``RequestBudget``. Results are deduplicated by URL across pages
+    and queries, keeping the first occurrence in query order. The API key is
+    sent in the ``X-Api-Key`` header, so it never appears in a logged URL.
+    """
+
+    def __init__(self, api_key: Optional[str], session: Optional[requests.Session] = None,
+                 base_url: str = NEWS_API_URL, page_size: int = 100, max_pages: int = 5,
+                 max_requests: Optional[int] = None, max_retries: int = 4,
+                 backoff: float = 1.0, max_retry_delay: float = 60, max_workers: int = 4,
+                 timeout: float = 30, metrics: Optional[Metrics] = None):
+        self.api_key = api_key
+        self.session = session or requests.Session()
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_requests = max_requests
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # Upper bound on any wait between attempts, whatever Retry-After asks for
+        self.max_retry_delay = max_retry_delay
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.metrics = metrics or NullMetrics()
+
+    def fetch(self, queries: List[str], params: Dict,
+              budget: Optional[RequestBudget] = None) -> List[Dict]:
+        """Fetch every page of every query and return the deduplicated articles.
+
+        ``params`` holds the shared search parameters (dates, language,
+        sorting); ``q``, ``page`` and ``pageSize`` are filled in per request.
+        Raises NewsAPIError only if every query failed.
+        """
+        budget = budget or RequestBudget(self.max_requests)
+        if len(queries) == 1 or self.max_workers == 1:
+            results = [self._fetch_or_error(query, params, budget) for query in queries]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as executor:
+                results = list(executor.map(
+                    lambda query: self._fetch_or_error(query, params, budget), queries))
+
+        errors = [result for result in results if isinstance(result, NewsAPIError)]
+        if queries and len(errors) == len(queries):
+            raise errors[0]
+        for query, result in zip(queries, results):
+            if isinstance(result, NewsAPIError):
+                logger.warning("Error from NewsAPI for query %r: %s", query, result)
+
+        articles = []
+        seen_urls = set()
+        for result in results:
+            if isinstance(result, NewsAPIError):
+                continue
+            for article in result:
+                if article.get('url') in seen_urls:
+                    continue
+                seen_urls.add(article.get('url'))
+                articles.append(article)
+        return articles
+
+    def _fetch_or_error(self, query: str, params: Dict, budget: RequestBudget):
+        try:
+            return self.fetch_query(query, params, budget)
+        except NewsAPIError as e:
+            return e
+
+    def fetch_query(self, query: str, params: Dict,
+                    budget: Optional[RequestBudget] = None) -> List[Dict]:
+        """Fetch all pages of a single query, stopping early when results run out.
+
+        Raises NewsAPIError only if the first page fails; an error on a later
+        page ends pagination and keeps the articles already fetched.
+        """
+        budget = budget or RequestBudget(self.max_requests)
+        articles = []
+        for page in range(1, self.max_pages + 1):
+            try:
+                data = self._get_page(dict(params, q=query, page=page, pageSize=self.page_size), budget)
+            except NewsAPIError as e:
+                if page == 1:
+                    raise
+                logger.warning("Error from NewsAPI for query %r on page %d, keeping %d articles: %s",
+                               query, page, len(articles), e)
+                break
+            if data is None:
+                break
+            page_articles = data.get('articles', [])
+            articles.extend(page_articles)
+            if len(page_articles) < self.page_size or page * self.page_size >= data.get('totalResults', 0):
+                break
+        return articles
+
+    def _get_page(self, params: Dict, budget: RequestBudget) -> Optional[Dict]:
+        """Request one page with retries; None means pagination should stop"""
+        headers = {'X-Api-Key': self.api_key} if self.api_key else {}
+        for attempt in range(self.max_retries + 1):
+            if not budget.take():
+                logger.warning("NewsAPI request budget exhausted")
+                self.metrics.inc('newsapi_budget_exhausted_total')
+                return None
+            if attempt:
+                self.metrics.inc('newsapi_retries_total')
+            try:
+                with self.metrics.timer('newsapi_request_seconds'):
+                    response = self.session.get(self.base_url, params=params, headers=headers,
+                                                timeout=self.timeout)
+            except requests.RequestException as e:
+                self.metrics.inc('newsapi_requests_total', status='error')
+                if attempt == self.max_retries:
+                    raise NewsAPIError(str(e))
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            self.metrics.inc('newsapi_requests_total', status=response.status_code)
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response.headers.get('Retry-After')))
+                continue
+
+            try:
+                data = response.json()
+            except ValueError:
+                raise NewsAPIError(f"Invalid response from NewsAPI (HTTP {response.status_code})") from None
+
+            if data.get('status') == 'ok':
+                return data
+            # Plans with a result cap reject pages past it; that just ends pagination
+            if data.get('code') == 'maximumResultsReached' and params.get('page', 1) > 1:
+                return None
+            raise NewsAPIError(data.get('message', 'Unknown error'))
+
+        raise NewsAPIError("Retries exhausted")
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before the next attempt"""
+        if retry_after:
+            try:
+                return min(self.max_retry_delay, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return min(self.max_retry_delay, self.backoff * (2 ** attempt) * (0.5 + random.random() / 2))
@@ -0,0 +1,36 @@
+from typing import Dict, Optional, Tuple
+
+from batch_scoring import BatchScorer
+from html_extract import clean_text, extract_article_text
+
+# CPU stage of process-pool scraping: downloaded page bytes are parsed,
+# extracted and scored here, in worker processes, so the downloading threads
+# never contend with parsing for the GIL. Kept free of the agent and requests
+# so spawned workers import only the parser and the scorer.
+
+# Per-process scorer, built from the agent's taxonomy by init_worker
+_scorer: Optional[BatchScorer] = None
+
+
+def init_worker(taxonomy: Dict):
+    global _scorer
+    _scorer = BatchScorer(taxonomy)
+
+
+def extract_text(data: bytes, encoding: str = 'utf-8', max_text_chars: Optional[int] = None) -> str:
+    """Extract and clean the article text of a downloaded page"""
+    return clean_text(extract_article_text((data,), encoding=encoding, max_text_chars=max_text_chars))
+
+
+def parse_and_score(prefix: str, data: Optional[bytes] = None, encoding: str = 'utf-8',
+                    text: str = "", max_text_chars: Optional[int] = None) -> Tuple[str, Dict]:
+    """Extract a page's article text and score it, returning (text, score_content-shaped result).
+
+    ``prefix`` is the article's NewsAPI content or description. Without
+    ``data`` the given ``text``, e.g. from the scrape cache, is scored as is.
+    """
+    if data is not None:
+        text = extract_text(data, encoding, max_text_chars)
+    # Same combination as InsuranceClimateAgent.scoring_text
+    content = f"{prefix} {text}" if text else prefix
+    return text, _scorer.score([content])[0]
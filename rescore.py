@@ -0,0 +1,93 @@
+import argparse
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# As in worker.py, the agent and the result store are imported when needed so
+# argument errors and --help return immediately.
+
+
+def rescore_store(store, agent, processes: Optional[int] = None, batch_size: int = 10000) -> Dict:
+    """Rescore every stored article text under the agent's taxonomy, returning a summary.
+
+    Texts are read from the store in batches and scored with ``analyze_batch``
+    sharded over ``processes`` worker processes. Results are written under
+    the agent's taxonomy version next to the scores of other versions; the
+    articles the dashboard shows are left as they are. No network access is
+    needed.
+    """
+    processes = processes or os.cpu_count() or 1
+    version = agent.taxonomy_version
+    started = time.monotonic()
+    scored = 0
+    for batch in store.iter_texts(batch_size):
+        article_ids = [article_id for article_id, _ in batch]
+        texts = [text for _, text in batch]
+        # One shard per process, so every batch is spread over the whole pool
+        shard_size = max(100, -(-len(texts) // processes))
+        results = agent.analyze_batch(texts, processes=processes, shard_size=shard_size)
+        scored += store.write_scores(version, zip(article_ids, results))
+        elapsed = time.monotonic() - started
+        logger.info("Rescored %d articles under taxonomy %s (%.0f articles/s)", scored, version,
+                    scored / max(elapsed, 1e-9))
+
+    missing = store.count() - scored
+    if missing > 0:
+        logger.warning("%d stored articles have no saved text and were not rescored", missing)
+    return {'version': version, 'scored': scored, 'missing': max(missing, 0),
+            'seconds': round(time.monotonic() - started, 3)}
+
+
+def print_comparison(transitions: Dict, old: str, new: str):
+    """Print how many articles moved between risk levels from one taxonomy version to another"""
+    levels = ['HIGH', 'MEDIUM', 'LOW', 'UNDEFINED']
+    print(f"\nRisk levels under taxonomy {old} (rows) vs {new} (columns):")
+    print(f"{'':>10}" + ''.join(f"{level:>10}" for level in levels))
+    for old_level in levels:
+        counts = [transitions.get((old_level, new_level), 0) for new_level in levels]
+        print(f"{old_level:>10}" + ''.join(f"{count:>10}" for count in counts))
+    changed = sum(count for (old_level, new_level), count in transitions.items() if old_level != new_level)
+    print(f"\n{changed} of {sum(transitions.values())} articles changed risk level")
+
+
+def main():
+    # Settings such as RESULT_STORE may come from .env, so load it before reading defaults
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Rescore the stored corpus under a taxonomy version")
+    parser.add_argument('--store', default=os.getenv('RESULT_STORE'),
+                        help="SQLite result store to rescore")
+    parser.add_argument('--taxonomy', default=os.getenv('TAXONOMY_FILE'),
+                        help="taxonomy file to score with (default: TAXONOMY_FILE or taxonomy.json)")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help="worker processes to score with (default: one per core)")
+    parser.add_argument('--batch-size', type=int, default=10000,
+                        help="article texts read from the store and scored per batch")
+    parser.add_argument('--compare', metavar='VERSION',
+                        help="afterwards, compare risk levels with those under this taxonomy version")
+    parser.add_argument('--json-logs', action='store_true',
+                        help="log structured JSON lines instead of plain messages")
+    args = parser.parse_args()
+    if not args.store:
+        parser.error("--store or RESULT_STORE is required")
+
+    from instrumentation import configure_logging
+    from insurance_climate_agent import InsuranceClimateAgent
+    from result_store import ResultStore
+
+    configure_logging(json_logs=args.json_logs)
+    store = ResultStore(args.store)
+    agent = InsuranceClimateAgent(taxonomy_file=args.taxonomy)
+    summary = rescore_store(store, agent, processes=args.processes, batch_size=args.batch_size)
+    logger.info("Rescored %d articles under taxonomy %s in %.1fs", summary['scored'], summary['version'],
+                summary['seconds'])
+    if args.compare:
+        print_comparison(store.compare_versions(args.compare, summary['version']), args.compare,
+                         summary['version'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from rollups import Rollups, article_keys
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    source TEXT,
+    date TEXT,
+    risk_level TEXT NOT NULL,
+    risk_score INTEGER,
+    confidence REAL,
+    risk_assessment TEXT NOT NULL,
+    affected_sectors TEXT NOT NULL,
+    impact_analysis TEXT NOT NULL,
+    preview TEXT,
+    ingested_at REAL NOT NULL,
+    syndicated_sources TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS articles_risk_level_date ON articles (risk_level, date);
+CREATE INDEX IF NOT EXISTS articles_date ON articles (date);
+
+CREATE TABLE IF NOT EXISTS article_sectors (
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    sector TEXT NOT NULL,
+    PRIMARY KEY (article_id, sector)
+);
+CREATE INDEX IF NOT EXISTS article_sectors_sector ON article_sectors (sector, article_id);
+
+CREATE TABLE IF NOT EXISTS article_impacts (
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    area TEXT NOT NULL,
+    level TEXT NOT NULL,
+    matches INTEGER NOT NULL,
+    PRIMARY KEY (article_id, area)
+);
+CREATE INDEX IF NOT EXISTS article_impacts_area_level ON article_impacts (area, level, article_id);
+
+CREATE TABLE IF NOT EXISTS rollups (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    level TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key, level)
+);
+
+CREATE TABLE IF NOT EXISTS article_texts (
+    article_id INTEGER PRIMARY KEY REFERENCES articles (id) ON DELETE CASCADE,
+    text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS article_scores (
+    taxonomy_version TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    risk_level TEXT NOT NULL,
+    risk_score INTEGER,
+    confidence REAL,
+    risk_assessment TEXT NOT NULL,
+    affected_sectors TEXT NOT NULL,
+    impact_analysis TEXT NOT NULL,
+    scored_at REAL NOT NULL,
+    PRIMARY KEY (taxonomy_version, article_id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ResultStore:
+    """Indexed SQLite store for analyzed articles.
+
+    Each article is one compact row. The nested risk, sector and impact
+    results are kept as JSON so the row round-trips to the exact
+    ``save_analysis`` shape. Side tables index sectors and impact levels, and
+    the articles table is indexed on risk level and date, so filtered queries
+    read only matching rows. Appends upsert by URL in a single transaction,
+    update the dashboard rollups by the difference each article makes, and
+    bump the corpus ``version``. The text each article was scored on is kept
+    in its own table, so the corpus can be rescored under another taxonomy
+    without network access; scores per taxonomy version sit side by side in
+    ``article_scores``.
+    """
+
+    def __init__(self, path: str = "insurance_climate_analysis.db"):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def _migrate(self):
+        """Add columns introduced after a store file was created"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(articles)')}
+        if 'syndicated_sources' not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN syndicated_sources TEXT NOT NULL DEFAULT '[]'")
+        # Stores created before rollups existed get them computed once
+        has_articles = self._conn.execute('SELECT 1 FROM articles LIMIT 1').fetchone()
+        if has_articles and not self._conn.execute('SELECT 1 FROM rollups LIMIT 1').fetchone():
+            self._rebuild_rollups()
+
+    def append(self, articles: Iterable[Dict], texts: Optional[Dict[str, str]] = None,
+               taxonomy_version: Optional[str] = None) -> int:
+        """Insert or update articles by URL, returning how many were written.
+
+        ``texts`` maps URLs to the text each article was scored on. With a
+        ``taxonomy_version``, the scores are also recorded under that version.
+        """
+        written = 0
+        deltas = {}
+        scored_at = time.time()
+        with self._lock:
+            try:
+                for article in articles:
+                    article_id = self._upsert(article, deltas)
+                    if texts and article['url'] in texts:
+                        self._conn.execute('INSERT OR REPLACE INTO article_texts VALUES (?, ?)',
+                                           (article_id, texts[article['url']]))
+                    if taxonomy_version is not None:
+                        self._write_score(taxonomy_version, article_id, article, scored_at)
+                    written += 1
+                self._apply_rollup_deltas(deltas)
+                if written:
+                    self._conn.execute(
+                        "INSERT INTO meta VALUES ('version', '1') "
+                        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return written
+
+    def append_analysis(self, analysis: Dict) -> int:
+        """Append every article of a risk-level grouped analysis"""
+        return self.append(article for articles in analysis.values() for article in articles)
+
+    def _upsert(self, article: Dict, deltas: Dict) -> int:
+        previous = self._conn.execute(
+            'SELECT risk_level, affected_sectors, impact_analysis, date FROM articles WHERE url = ?',
+            (article['url'],)
+        ).fetchone()
+        if previous:
+            for key in article_keys(self._rollup_fields(previous)):
+                deltas[key] = deltas.get(key, 0) - 1
+        for key in article_keys(article):
+            deltas[key] = deltas.get(key, 0) + 1
+
+        risk = article['risk_assessment']
+        row = (
+            article['url'], article.get('title'), article.get('source'), article.get('date'),
+            risk['level'], risk.get('score'), risk.get('confidence'),
+            json.dumps(risk), json.dumps(article.get('affected_sectors', [])),
+            json.dumps(article.get('impact_analysis', {})), article.get('preview'), time.time(),
+            json.dumps(article.get('syndicated_sources', []))
+        )
+        article_id = self._conn.execute("""
+            INSERT INTO articles (url, title, source, date, risk_level, risk_score, confidence,
+                                  risk_assessment, affected_sectors, impact_analysis, preview, ingested_at,
+                                  syndicated_sources)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title, source = excluded.source, date = excluded.date,
+                risk_level = excluded.risk_level, risk_score = excluded.risk_score,
+                confidence = excluded.confidence, risk_assessment = excluded.risk_assessment,
+                affected_sectors = excluded.affected_sectors, impact_analysis = excluded.impact_analysis,
+                preview = excluded.preview, ingested_at = excluded.ingested_at,
+                syndicated_sources = excluded.syndicated_sources
+            RETURNING id
+        """, row).fetchone()[0]
+
+        self._conn.execute('DELETE FROM article_sectors WHERE article_id = ?', (article_id,))
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO article_sectors VALUES (?, ?)',
+            [(article_id, sector) for sector in article.get('affected_sectors', [])]
+        )
+        self._conn.execute('DELETE FROM article_impacts WHERE article_id = ?', (article_id,))
+        self._conn.executemany(
+            'INSERT INTO article_impacts VALUES (?, ?, ?, ?)',
+            [(article_id, area, impact['level'], impact['matches'])
+             for area, impact in article.get('impact_analysis', {}).items()]
+        )
+        return article_id
+
+    def _write_score(self, taxonomy_version: str, article_id: int, scores: Dict, scored_at: float):
+        risk = scores['risk_assessment']
+        self._conn.execute(
+            'INSERT OR REPLACE INTO article_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (taxonomy_version, article_id, risk['level'], risk.get('score'), risk.get('confidence'),
+             json.dumps(risk), json.dumps(scores['affected_sectors']),
+             json.dumps(scores['impact_analysis']), scored_at)
+        )
+
+    @staticmethod
+    def _rollup_fields(row: Tuple) -> Dict:
+        """Rebuild the article fields that rollups count from a stored row"""
+        return {
+            'risk_assessment': {'level': row[0]},
+            'affected_sectors': json.loads(row[1]),
+            'impact_analysis': json.loads(row[2]),
+            'date': row[3]
+        }
+
+    def _apply_rollup_deltas(self, deltas: Dict):
+        self._conn.executemany(
+            'INSERT INTO rollups VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(dimension, key, level) DO UPDATE SET count = count + excluded.count',
+            [(dimension, key, level, delta) for (dimension, key, level), delta in deltas.items() if delta]
+        )
+        self._conn.execute('DELETE FROM rollups WHERE count = 0')
+
+    def _rebuild_rollups(self):
+        self._conn.execute('DELETE FROM rollups')
+        deltas = {}
+        for row in self._conn.execute(
+                'SELECT risk_level, affected_sectors, impact_analysis, date FROM articles ORDER BY id'):
+            for key in article_keys(self._rollup_fields(row)):
+                deltas[key] = deltas.get(key, 0) + 1
+        self._apply_rollup_deltas(deltas)
+
+    def rollups(self) -> Rollups:
+        """Return the dashboard aggregates over the whole store without reading any article"""
+        with closing(self._connect()) as conn:
+            return Rollups.from_counts(conn.execute(
+                'SELECT dimension, key, level, count FROM rollups ORDER BY rowid'))
+
+    @staticmethod
+    def _where(risk_level: Union[str, Sequence[str], None] = None,
+               sector: Union[str, Sequence[str], None] = None,
+               impact_area: Optional[str] = None, impact_level: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> Tuple[str, List]:
+        """Build the WHERE clause and parameters for the supported filters"""
+        def any_of(column: str, values: Union[str, Sequence[str]]) -> str:
+            values = [values] if isinstance(values, str) else list(values)
+            params.extend(values)
+            if len(values) == 1:
+                return f'{column} = ?'
+            return f"{column} IN ({','.join('?' * len(values))})"
+
+        clauses, params = [], []
+        if risk_level:
+            clauses.append(any_of('a.risk_level', risk_level))
+        if since:
+            clauses.append('a.date >= ?')
+            params.append(since)
+        if until:
+            clauses.append('a.date <= ?')
+            params.append(until)
+        if sector:
+            clauses.append('a.id IN (SELECT article_id FROM article_sectors WHERE '
+                           + any_of('sector', sector) + ')')
+        if impact_area or impact_level:
+            impact_clauses = []
+            if impact_area:
+                impact_clauses.append('area = ?')
+                params.append(impact_area)
+            if impact_level:
+                impact_clauses.append('level = ?')
+                params.append(impact_level)
+            clauses.append('a.id IN (SELECT article_id FROM article_impacts WHERE '
+                           + ' AND '.join(impact_clauses) + ')')
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    @staticmethod
+    def _row_to_article(row: Tuple) -> Dict:
+        return {
+            'title': row[0],
+            'source': row[1],
+            'url': row[2],
+            'date': row[3],
+            'risk_assessment': json.loads(row[4]),
+            'affected_sectors': json.loads(row[5]),
+            'impact_analysis': json.loads(row[6]),
+            'preview': row[7],
+            'syndicated_sources': json.loads(row[8])
+        }
+
+    def query(self, limit: Optional[int] = None, offset: int = 0, order_by: str = 'id',
+              **filters) -> Iterator[Dict]:
+        """Stream articles matching the filters without loading the whole corpus.
+
+        Filters: ``risk_level``, ``sector``, ``impact_area``, ``impact_level``,
+        and an ISO ``since``/``until`` date range. ``risk_level`` and ``sector``
+        also accept a list, matching any of its values. ``order_by`` is one of
+        'id' (ingestion order), 'date', 'score' or 'confidence'.
+        """
+        order = {
+            'id': 'a.id',
+            'date': 'a.date DESC, a.id',
+            'score': 'a.risk_score DESC, a.confidence DESC, a.id',
+            'confidence': 'a.confidence DESC, a.id'
+        }[order_by]
+        where, params = self._where(**filters)
+        sql = ('SELECT a.title, a.source, a.url, a.date, a.risk_assessment, a.affected_sectors, '
+               'a.impact_analysis, a.preview, a.syndicated_sources FROM articles a' + where + ' ORDER BY ' + order)
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+
+        # A dedicated connection lets readers stream while appends continue
+        with closing(self._connect()) as conn:
+            for row in conn.execute(sql, params):
+                yield self._row_to_article(row)
+
+    def count(self, **filters) -> int:
+        """Count articles matching the same filters as ``query``"""
+        where, params = self._where(**filters)
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM articles a' + where, params).fetchone()[0]
+
+    def known_urls(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of URLs already stored"""
+        urls = list(urls)
+        known = set()
+        with closing(self._connect()) as conn:
+            for i in range(0, len(urls), 500):
+                batch = urls[i:i + 500]
+                known.update(row[0] for row in conn.execute(
+                    'SELECT url FROM articles WHERE url IN (%s)' % ','.join('?' * len(batch)), batch))
+        return known
+
+    def iter_texts(self, batch_size: int = 1000) -> Iterator[List[Tuple[int, str]]]:
+        """Stream the stored scoring texts as batches of (article_id, text) in id order"""
+        last_id = 0
+        with closing(self._connect()) as conn:
+            while True:
+                batch = conn.execute(
+                    'SELECT article_id, text FROM article_texts WHERE article_id > ? ORDER BY article_id LIMIT ?',
+                    (last_id, batch_size)).fetchall()
+                if not batch:
+                    return
+                yield batch
+                last_id = batch[-1][0]
+
+    def write_scores(self, taxonomy_version: str, scores: Iterable[Tuple[int, Dict]]) -> int:
+        """Record (article_id, score_content-shaped result) pairs under a taxonomy version"""
+        written = 0
+        scored_at = time.time()
+        with self._lock:
+            try:
+                for article_id, result in scores:
+                    self._write_score(taxonomy_version, article_id, result, scored_at)
+                    written += 1
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return written
+
+    def taxonomy_versions(self) -> Dict[str, int]:
+        """Return how many articles have scores recorded under each taxonomy version"""
+        with closing(self._connect()) as conn:
+            return dict(conn.execute(
+                'SELECT taxonomy_version, COUNT(*) FROM article_scores GROUP BY taxonomy_version ORDER BY 1'))
+
+    def compare_versions(self, old: str, new: str) -> Dict[Tuple[str, str], int]:
+        """Count articles scored under both versions by (old risk level, new risk level)"""
+        with closing(self._connect()) as conn:
+            return {(old_level, new_level): count for old_level, new_level, count in conn.execute(
+                'SELECT o.risk_level, n.risk_level, COUNT(*) FROM article_scores o '
+                'JOIN article_scores n ON n.article_id = o.article_id '
+                'WHERE o.taxonomy_version = ? AND n.taxonomy_version = ? '
+                'GROUP BY o.risk_level, n.risk_level', (old, new))}
+
+    def version(self) -> int:
+        """Return a counter that changes whenever the stored corpus changes"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def load_analysis(self, **filters) -> Dict:
+        """Return matching articles grouped by risk level, in the ``save_analysis`` shape"""
+        analysis = {}
+        for article in self.query(**filters):
+            analysis.setdefault(article['risk_assessment']['level'], []).append(article)
+        return analysis
+
+    def export_json(self, filename: str = "insurance_climate_analysis.json", **filters):
+        """Write matching articles to a JSON file in the ``save_analysis`` shape"""
+        with open(filename, 'w') as f:
+            json.dump(self.load_analysis(**filters), f, indent=2)
+
+    def close(self):
+        """Close the writer connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,78 @@
+from typing import Dict, Iterable, List, Tuple
+
+# Rollup dimensions, as stored in the result store's rollups table
+TOTAL = 'total'
+RISK_LEVEL = 'risk_level'
+SECTOR = 'sector'
+IMPACT = 'impact'
+DAY = 'day'
+
+
+def article_keys(article: Dict) -> List[Tuple[str, str, str]]:
+    """Return the (dimension, key, level) counters an article contributes to"""
+    risk_level = article['risk_assessment']['level']
+    keys = [(TOTAL, '', ''), (RISK_LEVEL, risk_level, '')]
+    keys.extend((SECTOR, sector, '') for sector in article.get('affected_sectors', []))
+    keys.extend((IMPACT, area, impact['level'])
+                for area, impact in article.get('impact_analysis', {}).items())
+    if article.get('date'):
+        keys.append((DAY, article['date'][:10], risk_level))
+    return keys
+
+
+class Rollups:
+    """Aggregate counts behind the dashboard charts, updated one article at a time.
+
+    Tracks the article total, articles per risk level, articles per sector,
+    an impact area x impact level matrix, and articles per publication day
+    and risk level. Adding or removing an article touches only its own
+    counters, so charts read the aggregates without scanning the corpus.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.risk_levels: Dict[str, int] = {}
+        self.sectors: Dict[str, int] = {}
+        self.impacts: Dict[str, Dict[str, int]] = {}
+        self.daily: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_analysis(cls, analysis: Dict) -> 'Rollups':
+        """Build rollups for an analysis grouped by risk level"""
+        rollups = cls()
+        for articles in analysis.values():
+            for article in articles:
+                rollups.add(article)
+        return rollups
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[Tuple[str, str, str, int]]) -> 'Rollups':
+        """Build rollups from stored (dimension, key, level, count) rows"""
+        rollups = cls()
+        for dimension, key, level, count in counts:
+            rollups._bump(dimension, key, level, count)
+        return rollups
+
+    def add(self, article: Dict):
+        """Count an article"""
+        for dimension, key, level in article_keys(article):
+            self._bump(dimension, key, level, 1)
+
+    def remove(self, article: Dict):
+        """Stop counting an article, e.g. before replacing it with a rescored copy"""
+        for dimension, key, level in article_keys(article):
+            self._bump(dimension, key, level, -1)
+
+    def _bump(self, dimension: str, key: str, level: str, delta: int):
+        if dimension == TOTAL:
+            self.total += delta
+        elif dimension == RISK_LEVEL:
+            self.risk_levels[key] = self.risk_levels.get(key, 0) + delta
+        elif dimension == SECTOR:
+            self.sectors[key] = self.sectors.get(key, 0) + delta
+        elif dimension == IMPACT:
+            levels = self.impacts.setdefault(key, {})
+            levels[level] = levels.get(level, 0) + delta
+        elif dimension == DAY:
+            levels = self.daily.setdefault(key, {})
+            levels[level] = levels.get(level, 0) + delta
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ScrapeCache:
+    """Persistent cache of extracted article text keyed by URL.
+
+    Entries younger than ``ttl`` seconds are served without touching the
+    network. Older entries keep their ETag/Last-Modified validators so the
+    caller can revalidate them with a conditional request. The cache is kept
+    under ``max_bytes`` of stored text by evicting least recently used entries.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 6 * 3600, max_bytes: int = 200 * 1024 * 1024):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'scrape_cache.sqlite3')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'refetched': 0, 'evictions': 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)')
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Look up a cached page, marking it as recently used.
+
+        Returns None on a miss. Otherwise the dict has the cached ``text``, the
+        ``etag`` and ``last_modified`` validators, and ``fresh`` telling whether
+        it can be used without revalidation.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (now, url))
+            self._conn.commit()
+
+            fresh = now - row[3] < self.ttl
+            if fresh:
+                self.stats['hits'] += 1
+            return {'text': row[0], 'etag': row[1], 'last_modified': row[2], 'fresh': fresh}
+
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict:
+        """Build the conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def mark_revalidated(self, url: str):
+        """Restart the TTL of an entry the server reported as not modified"""
+        with self._lock:
+            self._conn.execute('UPDATE pages SET fetched_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+            self.stats['revalidated'] += 1
+
+    def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store freshly extracted text for a URL and evict old entries if needed"""
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute('SELECT 1 FROM pages WHERE url = ?', (url,)).fetchone()
+            if exists:
+                self.stats['refetched'] += 1
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, text, etag, last_modified, now, now, len(text.encode('utf-8')))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute(
+                'SELECT url, size FROM pages ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM pages WHERE url = ?', (url,))
+            total -= size
+            self.stats['evictions'] += 1
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
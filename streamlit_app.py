@@ -2,10 +2,16 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
 from insurance_climate_agent import InsuranceClimateAgent
+from analysis_cache import AnalysisCache
+from result_store import ResultStore
+from rollups import Rollups
 import pandas as pd
-from datetime import datetime
-from collections import defaultdict
 
 # Set page config
 st.set_page_config(
@@ -50,14 +56,50 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+REFRESH_INTERVAL = 30 * 60
+# Seconds between chart redraws while articles are still streaming in
+REDRAW_INTERVAL = 1.0
+# Cards shown while the first run streams in, before the paginated list takes over
+STREAMED_CARDS = 25
+
+# Shared across reruns and sessions so every session uses one warm agent
+@st.cache_resource
+def get_agent():
+    """Create the process-wide agent"""
+    return InsuranceClimateAgent(cache_dir=os.getenv('SCRAPE_CACHE_DIR'))
+
+# Shared across reruns and sessions; None unless RESULT_STORE is set
+@st.cache_resource
+def get_store():
+    """Open the result store the ingestion job writes to, if one is configured"""
+    store_path = os.getenv('RESULT_STORE')
+    return ResultStore(store_path) if store_path else None
+
+# Shared across reruns and sessions so filter changes never re-fetch the news
+@st.cache_resource
+def get_analysis_cache():
+    """Create the process-wide analysis cache.
+
+    With RESULT_STORE set the dashboard only reads the store filled by the
+    ingestion job; otherwise it runs a single warm agent itself.
+    """
+    store = get_store()
+    if store:
+        # Only the corpus version and the chart rollups the store keeps up to date
+        # are cached; article pages are read from SQLite as they are shown
+        return AnalysisCache(lambda: {'version': store.version()}, ttl=REFRESH_INTERVAL,
+                             summarize=lambda snapshot: store.rollups())
+    return AnalysisCache(get_agent().get_insurance_climate_news, ttl=REFRESH_INTERVAL,
+                         summarize=Rollups.from_analysis)
+
 # Create a pie chart for risk distribution
-def create_risk_distribution_chart(analysis):
+def create_risk_distribution_chart(rollups):
     """Create a pie chart showing risk level distribution"""
     risk_counts = {
-        'High Risk': len(analysis.get('HIGH', [])),
-        'Medium Risk': len(analysis.get('MEDIUM', [])),
-        'Low Risk': len(analysis.get('LOW', [])),
-        'Undefined': len(analysis.get('UNDEFINED', []))
+        'High Risk': rollups.risk_levels.get('HIGH', 0),
+        'Medium Risk': rollups.risk_levels.get('MEDIUM', 0),
+        'Low Risk': rollups.risk_levels.get('LOW', 0),
+        'Undefined': rollups.risk_levels.get('UNDEFINED', 0)
     }
 
     colors = ['#ff4b4b', '#ffa600', '#2ac769', '#808495']
@@ -78,15 +120,10 @@ def create_risk_distribution_chart(analysis):
     return fig
 
 # Create a bar chart for sector impact frequency
-def create_sector_impact_chart(analysis):
+def create_sector_impact_chart(rollups):
     """Create a bar chart showing sector impact frequency"""
-    sector_counts = defaultdict(int)
-    total_articles = sum(len(articles) for articles in analysis.values())
-
-    for risk_level, articles in analysis.items():
-        for article in articles:
-            for sector in article['affected_sectors']:
-                sector_counts[sector] += 1
+    sector_counts = rollups.sectors
+    total_articles = rollups.total
 
     if total_articles > 0:
         sector_data = {
@@ -114,23 +151,14 @@ def create_sector_impact_chart(analysis):
     return None
 
 # Create a heatmap for impact analysis
-def create_impact_heatmap(analysis):
+def create_impact_heatmap(rollups):
     """Create a heatmap of impact areas across risk levels"""
-    impact_data = {
-        'Financial': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0},
-        'Operational': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0},
-        'Regulatory': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0},
-        'Reputational': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-    }
-
-    for risk_level, articles in analysis.items():
-        for article in articles:
-            for area, impact in article['impact_analysis'].items():
-                impact_data[area][impact['level']] += 1
+    # Rows follow whichever impact areas the taxonomy produced
+    impact_data = rollups.impacts
 
     x_labels = ['HIGH', 'MEDIUM', 'LOW']
     y_labels = list(impact_data.keys())
-    z_values = [[impact_data[area][level] for level in x_labels] for area in y_labels]
+    z_values = [[impact_data[area].get(level, 0) for level in x_labels] for area in y_labels]
 
     fig = go.Figure(data=go.Heatmap(
         z=z_values,
@@ -149,9 +177,35 @@ def create_impact_heatmap(analysis):
 
     return fig
 
-# Display article in card format
-def display_article_card(article):
-    """Display an article in a card format"""
+# Create a stacked bar chart of articles per day
+def create_daily_trend_chart(rollups):
+    """Create a stacked bar chart of articles per publication day and risk level"""
+    if not rollups.daily:
+        return None
+
+    colors = {'HIGH': '#ff4b4b', 'MEDIUM': '#ffa600', 'LOW': '#2ac769', 'UNDEFINED': '#808495'}
+    days = sorted(rollups.daily)
+    fig = go.Figure(data=[
+        go.Bar(name=level, x=days, y=[rollups.daily[day].get(level, 0) for day in days],
+               marker_color=color)
+        for level, color in colors.items()
+    ])
+
+    fig.update_layout(
+        title="Articles per Day",
+        barmode='stack',
+        xaxis_title="Publication Date",
+        yaxis_title="Articles",
+        height=400
+    )
+
+    return fig
+
+# Rendered card HTML, cached by article content so reruns reuse it
+@st.cache_data(max_entries=5000, show_spinner=False)
+def article_card_html(content_hash, _article):
+    """Render an article card to HTML; content_hash identifies the article content"""
+    article = _article
     risk_color = {
         'HIGH': 'risk-high',
         'MEDIUM': 'risk-medium',
@@ -159,7 +213,14 @@ def display_article_card(article):
         'UNDEFINED': 'risk-undefined'
     }
 
-    st.markdown(f"""
+    # Syndicated copies of the same story are folded into this card
+    syndicated = ''
+    if article.get('syndicated_sources'):
+        links = ', '.join(f"<a href=\"{source['url']}\" target=\"_blank\">{source['source']}</a>"
+                          for source in article['syndicated_sources'])
+        syndicated = f"<p><strong>Also published by:</strong> {links}</p>"
+
+    return f"""
         <div class="article-card">
             <h4>{article['title']}</h4>
             <p><strong>Source:</strong> {article['source']} | <strong>Date:</strong> {article['date']}</p>
@@ -169,39 +230,40 @@ def display_article_card(article):
             <ul>
                 {''.join([f"<li>{area}: {impact['level']} (matches: {impact['matches']})</li>" for area, impact in article['impact_analysis'].items()])}
             </ul>
+            {syndicated}
             <p><a href="{article['url']}" target="_blank">Read full article</a></p>
         </div>
-    """, unsafe_allow_html=True)
-
-#  application
-def main():
-    st.title("🌍 Insurance Climate Risk Analyzer")
-
-    # Sidebar for controls
-    st.sidebar.header("🔍 Filters & Controls")
-    auto_refresh = st.sidebar.checkbox("Auto-refresh data", value=False)
-    if auto_refresh:
-        st.sidebar.info("Data will refresh every 30 minutes")
-
-    risk_filters = st.sidebar.multiselect(
-        "Filter by Risk Level",
-        ["HIGH", "MEDIUM", "LOW", "UNDEFINED"],
-        default=["HIGH", "MEDIUM", "LOW"]
-    )
+    """
 
-    # Main content
-    col1, col2 = st.columns([2, 1])
-
-    with col1:
-        st.markdown("### 🌐 Real-time Climate Risk Analysis")
-        with st.spinner("Fetching and analyzing climate news..."):
-            agent = InsuranceClimateAgent()
-            analysis = agent.get_insurance_climate_news()
+def card_html(article):
+    """Return the cached card HTML for an article"""
+    content_hash = hashlib.sha1(json.dumps(article, sort_keys=True).encode('utf-8')).hexdigest()
+    return article_card_html(content_hash, article)
 
-    if analysis:
-        # Overview metrics
-        total_articles = sum(len(articles) for articles in analysis.values())
-        high_risk = len(analysis.get('HIGH', []))
+# Display article in card format
+def display_article_card(article):
+    """Display an article in a card format"""
+    st.markdown(card_html(article), unsafe_allow_html=True)
+
+def coverage_period(rollups):
+    """Describe the publication dates the rollups span, e.g. a store filled by a backfill"""
+    days = sorted(rollups.daily)
+    if not days:
+        return "—"
+    first_day = datetime.strptime(days[0], "%Y-%m-%d")
+    last_day = datetime.strptime(days[-1], "%Y-%m-%d")
+    if first_day == last_day:
+        return first_day.strftime("%b %d, %Y")
+    if first_day.year == last_day.year:
+        return f"{first_day:%b %d} – {last_day:%b %d, %Y}"
+    return f"{first_day:%b %d, %Y} – {last_day:%b %d, %Y}"
+
+# Overview metrics and charts
+def render_overview(placeholder, rollups, refreshed_at):
+    """Draw the overview metrics and charts into a placeholder, replacing earlier content"""
+    with placeholder.container():
+        total_articles = rollups.total
+        high_risk = rollups.risk_levels.get('HIGH', 0)
 
         metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
 
@@ -210,31 +272,205 @@ def main():
         with metrics_col2:
             st.metric("🚨 High Risk Articles", high_risk)
         with metrics_col3:
-            st.metric("📅 Coverage Period", "Last 7 days")
+            st.metric("📅 Coverage Period", coverage_period(rollups))
         with metrics_col4:
-            st.metric("⏰ Last Updated", datetime.now().strftime("%Y-%m-%d %H:%M"))
+            st.metric("⏰ Last Updated", refreshed_at.strftime("%Y-%m-%d %H:%M"))
 
         # Visualizations
         chart_col1, chart_col2 = st.columns(2)
 
         with chart_col1:
-            st.plotly_chart(create_risk_distribution_chart(analysis), use_container_width=True)
-            st.plotly_chart(create_impact_heatmap(analysis), use_container_width=True)
+            st.plotly_chart(create_risk_distribution_chart(rollups), use_container_width=True)
+            st.plotly_chart(create_impact_heatmap(rollups), use_container_width=True)
 
         with chart_col2:
-            sector_chart = create_sector_impact_chart(analysis)
+            sector_chart = create_sector_impact_chart(rollups)
             if sector_chart:
                 st.plotly_chart(sector_chart, use_container_width=True)
+            daily_chart = create_daily_trend_chart(rollups)
+            if daily_chart:
+                st.plotly_chart(daily_chart, use_container_width=True)
+
+def risk_level_header(risk_level, count):
+    """Return the section header for one risk level"""
+    return f"<div class='header-style'>{risk_level} Risk Articles ({count})</div>"
+
+# Sorting and filtering of the article list
+SORT_OPTIONS = {
+    'Risk score': 'score',
+    'Confidence': 'confidence',
+    'Newest first': 'date'
+}
+
+def sort_key(order_by):
+    """Return a key function matching ResultStore.query's ordering"""
+    if order_by == 'score':
+        return lambda article: (-(article['risk_assessment'].get('score') or 0),
+                                -(article['risk_assessment'].get('confidence') or 0))
+    if order_by == 'confidence':
+        return lambda article: -(article['risk_assessment'].get('confidence') or 0)
+    return None
+
+# Keyed on the refresh time, so each filter combination is sorted once per refresh
+@st.cache_resource(max_entries=16, show_spinner=False)
+def filtered_articles(refreshed_at, risk_levels, sectors, since, until, order_by, _analysis):
+    """Filter and sort the in-memory analysis the same way the result store would"""
+    articles = [
+        article for risk_level in risk_levels for article in _analysis.get(risk_level, [])
+        if (not sectors or any(sector in sectors for sector in article['affected_sectors']))
+        and (not since or article['date'] >= since)
+        and (not until or article['date'] <= until)
+    ]
+    if order_by == 'date':
+        articles.sort(key=lambda article: article['date'], reverse=True)
+    else:
+        articles.sort(key=sort_key(order_by))
+    return articles
+
+def count_articles(analysis, refreshed_at, filters, order_by):
+    """Count the articles matching the filters"""
+    store = get_store()
+    if store:
+        return store.count(**filters)
+    return len(filtered_articles(refreshed_at, tuple(filters['risk_level']), tuple(filters['sector']),
+                                 filters['since'], filters['until'], order_by, analysis))
+
+def article_page(analysis, refreshed_at, filters, order_by, page, page_size):
+    """Return one page of matching articles"""
+    store = get_store()
+    if store:
+        # Filtered, sorted and paged by SQLite; only this page is read
+        return list(store.query(limit=page_size, offset=page * page_size, order_by=order_by, **filters))
+    articles = filtered_articles(refreshed_at, tuple(filters['risk_level']), tuple(filters['sector']),
+                                 filters['since'], filters['until'], order_by, analysis)
+    return articles[page * page_size:(page + 1) * page_size]
+
+def render_article_list(analysis, rollups, refreshed_at, risk_filters):
+    """Show one page of article cards with sector, date range and sort controls"""
+    st.markdown("### 📢 Detailed Analysis by Risk Level")
+
+    sector_filters = st.sidebar.multiselect("Filter by Sector", list(rollups.sectors))
+    days = sorted(rollups.daily)
+    since = until = None
+    if days:
+        first_day = datetime.strptime(days[0], "%Y-%m-%d").date()
+        last_day = datetime.strptime(days[-1], "%Y-%m-%d").date()
+        date_range = st.sidebar.date_input("Publication Date", value=(first_day, last_day),
+                                           min_value=first_day, max_value=last_day)
+        if len(date_range) == 2:
+            since = date_range[0].isoformat()
+            until = date_range[1].isoformat() + "T23:59:59Z"
+    sort_label = st.sidebar.selectbox("Sort Articles By", list(SORT_OPTIONS))
+    page_size = st.sidebar.selectbox("Articles per Page", [10, 25, 50], index=1)
+
+    if not risk_filters:
+        st.info("Select at least one risk level to list articles.")
+        return
+
+    filters = {'risk_level': risk_filters, 'sector': sector_filters, 'since': since, 'until': until}
+    total = count_articles(analysis, refreshed_at, filters, SORT_OPTIONS[sort_label])
+    pages = max(1, -(-total // page_size))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1) - 1
+    articles = article_page(analysis, refreshed_at, filters, SORT_OPTIONS[sort_label], page, page_size)
+
+    first = page * page_size + 1 if articles else 0
+    st.caption(f"Showing {first}–{page * page_size + len(articles)} of {total} articles")
+    # One markdown element per page instead of one per article
+    st.markdown(''.join(card_html(article) for article in articles), unsafe_allow_html=True)
+
+# Progressive first load
+def stream_dashboard(analysis_cache, risk_filters, status_column):
+    """Run the agent and fill in metrics, charts and article cards as results arrive.
+
+    Cards appear as soon as each article is scored, up to one page of them;
+    the charts are redrawn at most every REDRAW_INTERVAL seconds. Once the
+    run is cached the page reruns into the regular paginated view.
+    """
+    overview = st.empty()
+    st.markdown("### 📢 Detailed Analysis by Risk Level")
+    sections = {risk_level: (st.empty(), st.container()) for risk_level in risk_filters}
+
+    analysis = {}
+    rollups = Rollups()
+    shown = 0
+    last_draw = time.monotonic()
+    try:
+        with status_column, st.spinner("Fetching and analyzing climate news..."):
+            for article in analysis_cache.stream(get_agent().iter_insurance_climate_news()):
+                risk_level = article['risk_assessment']['level']
+                analysis.setdefault(risk_level, []).append(article)
+                rollups.add(article)
+                if risk_level in sections:
+                    header, cards = sections[risk_level]
+                    header.markdown(risk_level_header(risk_level, len(analysis[risk_level])),
+                                    unsafe_allow_html=True)
+                    if shown < STREAMED_CARDS:
+                        with cards:
+                            display_article_card(article)
+                        shown += 1
+                if time.monotonic() - last_draw >= REDRAW_INTERVAL:
+                    render_overview(overview, rollups, datetime.now())
+                    last_draw = time.monotonic()
+    except Exception as e:
+        st.warning(f"News analysis stopped early: {str(e)}")
+
+    if analysis_cache.has_analysis:
+        st.rerun()
+    if analysis:
+        render_overview(overview, rollups, datetime.now())
+    return analysis
+
+#  application
+def main():
+    st.title("🌍 Insurance Climate Risk Analyzer")
 
-        # Articles by risk level
-        st.markdown("### 📢 Detailed Analysis by Risk Level")
+    # Sidebar for controls
+    st.sidebar.header("🔍 Filters & Controls")
+    analysis_cache = get_analysis_cache()
+    auto_refresh = st.sidebar.checkbox("Auto-refresh data", value=analysis_cache.worker_running)
+    if auto_refresh:
+        analysis_cache.start_worker()
+        st.sidebar.info("Data will refresh every 30 minutes")
+    else:
+        analysis_cache.stop_worker()
+
+    risk_filters = st.sidebar.multiselect(
+        "Filter by Risk Level",
+        ["HIGH", "MEDIUM", "LOW", "UNDEFINED"],
+        default=["HIGH", "MEDIUM", "LOW"]
+    )
+
+    # Main content
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("### 🌐 Real-time Climate Risk Analysis")
 
-        for risk_level in risk_filters:
-            if risk_level in analysis and analysis[risk_level]:
-                st.markdown(f"<div class='header-style'>{risk_level} Risk Articles ({len(analysis[risk_level])})</div>", unsafe_allow_html=True)
-                for article in analysis[risk_level]:
-                    display_article_card(article)
+    # The first agent run streams into the page; later reads come from the cache
+    if not get_store() and not analysis_cache.has_analysis and not analysis_cache.refreshing:
+        has_data = bool(stream_dashboard(analysis_cache, risk_filters, col1))
     else:
+        with col1:
+            with st.spinner("Fetching and analyzing climate news..."):
+                analysis, rollups, refreshed_at = analysis_cache.get_with_summary()
+                store = get_store()
+                # Pages and counts read SQLite live; rebuild the cached rollups as soon as
+                # the store changes so the charts never lag behind them
+                if store and analysis.get('version') != store.version():
+                    analysis_cache.refresh()
+                    analysis, rollups, refreshed_at = analysis_cache.get_with_summary()
+
+        if get_store():
+            # The cached analysis is just the store's version; its rollups tell if it has articles
+            has_data = bool(rollups and rollups.total)
+        else:
+            has_data = bool(analysis)
+            rollups = rollups or Rollups.from_analysis(analysis)
+        if has_data:
+            render_overview(st.empty(), rollups, refreshed_at)
+            render_article_list(analysis, rollups, refreshed_at, risk_filters)
+
+    if not has_data:
         st.error("⚠️ No data available. Please check your API key and internet connection.")
 
     # Footer
@@ -0,0 +1,40 @@
+import json
+import os
+from typing import Dict, Optional
+
+# Shipped next to the agent; TAXONOMY_FILE or taxonomy_file= point at another version
+DEFAULT_TAXONOMY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy.json')
+
+INDICATOR_KEYS = ('keywords', 'weight', 'numerical_indicators', 'temporal_indicators')
+
+
+def load_taxonomy(path: Optional[str] = None) -> Dict:
+    """Load a versioned scoring taxonomy, raising ValueError if it is malformed.
+
+    The file holds a ``version`` label plus the ``risk_levels``,
+    ``risk_indicators``, ``insurance_sectors`` and ``impact_areas`` the agent
+    scores with. Scores computed under different versions are stored side by
+    side, so the label must change whenever any keyword or weight does.
+    Keywords are lowercased, since every scorer matches them against
+    lowercased text.
+    """
+    path = path or DEFAULT_TAXONOMY_FILE
+    with open(path, 'r') as f:
+        taxonomy = json.load(f)
+
+    for key in ('version', 'risk_levels', 'risk_indicators', 'insurance_sectors', 'impact_areas'):
+        if key not in taxonomy:
+            raise ValueError(f"Taxonomy {path} has no {key!r}")
+    taxonomy['version'] = str(taxonomy['version'])
+    for level, indicators in taxonomy['risk_indicators'].items():
+        if level not in taxonomy['risk_levels']:
+            raise ValueError(f"Taxonomy {path}: risk level {level!r} has no score in risk_levels")
+        missing = [key for key in INDICATOR_KEYS if key not in indicators]
+        if missing:
+            raise ValueError(f"Taxonomy {path}: risk level {level!r} is missing {', '.join(missing)}")
+        for key in ('keywords', 'numerical_indicators', 'temporal_indicators'):
+            indicators[key] = [keyword.lower() for keyword in indicators[key]]
+    for key in ('insurance_sectors', 'impact_areas'):
+        taxonomy[key] = {name: [keyword.lower() for keyword in keywords]
+                         for name, keywords in taxonomy[key].items()}
+    return taxonomy
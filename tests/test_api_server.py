@@ -0,0 +1,96 @@
+import gzip
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+import api_server
+from api_server import AnalysisAPI, make_server
+from result_store import ResultStore
+
+
+def article(i, level='HIGH'):
+    return {
+        'url': f"https://example.com/story/{i}",
+        'title': f"Flood losses mount for insurers, part {i}",
+        'source': 'Example News',
+        'date': f"2025-03-{i % 28 + 1:02d}T08:00:00Z",
+        'risk_assessment': {'level': level, 'score': 5 + i % 3, 'confidence': 0.8},
+        'affected_sectors': ['property'],
+        'impact_analysis': {'financial': {'level': 'HIGH', 'matches': 3}},
+        'preview': "Severe flooding raised claims across the region"
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    store.append([article(i) for i in range(3)])
+    return store
+
+
+def test_matching_if_none_match_gets_304(store):
+    api = AnalysisAPI(store)
+    status, headers, body = api.handle('/articles', {})
+    assert status == 200
+    assert [a['url'] for a in json.loads(body)['articles']] == [article(i)['url'] for i in range(3)]
+
+    status, revalidated, body = api.handle('/articles', {}, if_none_match=headers['ETag'])
+    assert status == 304
+    assert body == b''
+    assert revalidated['ETag'] == headers['ETag']
+
+
+def test_append_changes_the_etag_and_the_cached_response(store):
+    api = AnalysisAPI(store)
+    _, headers, _ = api.handle('/articles', {})
+
+    store.append([article(3, level='LOW')])
+    status, new_headers, body = api.handle('/articles', {}, if_none_match=headers['ETag'])
+
+    assert status == 200
+    assert new_headers['ETag'] != headers['ETag']
+    assert json.loads(body)['total'] == 4
+
+
+def test_gzip_only_from_gzip_min_bytes(store, monkeypatch):
+    api = AnalysisAPI(store)
+    _, _, plain = api.handle('/articles', {})
+
+    monkeypatch.setattr(api_server, 'GZIP_MIN_BYTES', len(plain) + 1)
+    _, headers, body = api.handle('/articles', {}, accept_gzip=True)
+    assert 'Content-Encoding' not in headers
+    assert body == plain
+
+    monkeypatch.setattr(api_server, 'GZIP_MIN_BYTES', len(plain))
+    _, headers, body = api.handle('/articles', {}, accept_gzip=True)
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == plain
+
+
+def test_malformed_parameters_get_400(store):
+    status, _, body = AnalysisAPI(store).handle('/articles', {'limit': ['many']})
+
+    assert status == 400
+    assert json.loads(body) == {'error': "limit must be an integer"}
+
+
+def test_server_answers_500_when_the_store_fails():
+    class LockedStore:
+        def version(self):
+            raise sqlite3.OperationalError("database is locked")
+
+    server = make_server(AnalysisAPI(LockedStore()), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=5)
+        connection.request('GET', '/health')
+        response = connection.getresponse()
+        assert response.status == 500
+        assert json.loads(response.read()) == {'error': "Internal server error"}
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,37 @@
+from datetime import date
+
+from backfill import Backfill, chunk_key, date_chunks
+from test_scraping import DelayedPageServer
+
+START, END = date(2025, 3, 1), date(2025, 3, 3)
+
+
+def backfill(server, tmp_path, max_requests=None):
+    return Backfill(str(tmp_path / 'results.db'), START, END, workers=1, max_requests=max_requests,
+                    max_workers=4, per_host_limit=4, dedup_distance=None,
+                    news_api_url=f"{server.base_url}/v2/everything")
+
+
+def test_chunk_cut_short_by_the_budget_is_resumed(tmp_path):
+    with DelayedPageServer([0.01] * 4) as server:
+        # One search request per chunk: the third chunk finds the budget spent
+        first = backfill(server, tmp_path, max_requests=2)
+        try:
+            summary = first.run()
+        finally:
+            first.agent.close()
+        assert summary['completed'] == 2
+        assert [chunk_key(chunk) for chunk in first.pending_chunks()] == ["2025-03-03/2025-03-03"]
+
+        second = backfill(server, tmp_path)
+        try:
+            summary = second.run()
+        finally:
+            second.agent.close()
+
+    assert summary['completed'] == summary['chunks'] == 3
+    assert second.budget.used == 1
+    assert sorted(second.completed) == [chunk_key(chunk) for chunk in date_chunks(START, END)]
+    # Every chunk's search returns the same four stories; each is stored once
+    assert second.store.count() == 4
+    assert sum(stats['articles'] for stats in second.completed.values()) == 4
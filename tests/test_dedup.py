@@ -0,0 +1,87 @@
+import random
+
+from dedup import (DEFAULT_MAX_DISTANCE, FINGERPRINT_BITS, NearDuplicateIndex, article_fingerprint,
+                   hamming_distance)
+from insurance_climate_agent import InsuranceClimateAgent
+
+STORY = {
+    'url': "https://example.com/milton",
+    'source': {'id': None, 'name': 'Example News'},
+    'title': "Hurricane Milton losses could reach $50 billion, insurers warn",
+    'description': "Insured losses from Hurricane Milton could reach $50 billion as claims mount across "
+                   "Florida, analysts said on Friday.",
+    'content': "Insured losses from Hurricane Milton could reach $50 billion as claims mount across Florida, "
+               "analysts said on Friday, with property insurers bracing for the costliest storm… [+2345 chars]",
+    'publishedAt': "2025-03-01T08:00:00Z"
+}
+# The same wire story republished with a slightly longer excerpt
+WIRE_COPY = dict(STORY, url="https://other.example.org/milton", source={'id': None, 'name': 'Other Daily'},
+                 content=STORY['content'].replace("costliest storm…", "costliest storm in years…"))
+UNRELATED = dict(STORY, url="https://example.com/drought",
+                 title="Drought pushes crop insurance payouts to a record in Kansas",
+                 description="Farmers in Kansas filed record crop insurance claims after a second year "
+                             "of drought cut wheat yields.",
+                 content="Farmers in Kansas filed record crop insurance claims after a second year of "
+                         "drought cut wheat yields, the agriculture department said.")
+
+
+def flip_one_bit_per_band(fingerprint, bands):
+    """Flip the lowest bit of each of the given bands of the default index"""
+    for shift, _ in [NearDuplicateIndex()._bands[band] for band in bands]:
+        fingerprint ^= 1 << shift
+    return fingerprint
+
+
+def test_find_matches_up_to_max_distance_across_bands():
+    index = NearDuplicateIndex()
+    fingerprint = random.Random(1).getrandbits(FINGERPRINT_BITS)
+    index.add('story', fingerprint)
+
+    # max_distance bits, each in a different band: only the last band still agrees
+    near = flip_one_bit_per_band(fingerprint, range(DEFAULT_MAX_DISTANCE))
+    assert hamming_distance(fingerprint, near) == DEFAULT_MAX_DISTANCE
+    assert index.find(near) == 'story'
+
+    far = flip_one_bit_per_band(fingerprint, range(DEFAULT_MAX_DISTANCE + 1))
+    assert index.find(far) is None
+
+
+def test_find_agrees_with_a_full_scan():
+    rng = random.Random(7)
+    index = NearDuplicateIndex(max_distance=4)
+    stored = {f"key{i}": rng.getrandbits(FINGERPRINT_BITS) for i in range(200)}
+    for key, fingerprint in stored.items():
+        index.add(key, fingerprint)
+
+    for _ in range(200):
+        base = rng.choice(list(stored.values()))
+        probe = base
+        for bit in rng.sample(range(FINGERPRINT_BITS), rng.randint(0, 6)):
+            probe ^= 1 << bit
+        distances = {key: hamming_distance(probe, fingerprint) for key, fingerprint in stored.items()}
+        closest = min(distances.values())
+        found = index.find(probe)
+        # Ties may resolve to any equally close key
+        assert (distances[found] if found else None) == (closest if closest <= 4 else None)
+
+
+def test_wire_copy_collapses_and_unrelated_story_does_not():
+    assert hamming_distance(article_fingerprint(STORY), article_fingerprint(WIRE_COPY)) <= DEFAULT_MAX_DISTANCE
+    agent = InsuranceClimateAgent()
+
+    representatives, syndicated = agent.cluster_syndicated([STORY, WIRE_COPY, UNRELATED],
+                                                          {'fingerprints': {}})
+
+    assert [article['url'] for article in representatives] == [STORY['url'], UNRELATED['url']]
+    assert list(syndicated) == [STORY['url']]
+    assert [source['url'] for source in syndicated[STORY['url']]] == [WIRE_COPY['url']]
+
+
+def test_copies_beyond_dedup_distance_are_kept_apart():
+    distance = hamming_distance(article_fingerprint(STORY), article_fingerprint(WIRE_COPY))
+    agent = InsuranceClimateAgent(dedup_distance=distance - 1)
+
+    representatives, syndicated = agent.cluster_syndicated([STORY, WIRE_COPY], {'fingerprints': {}})
+
+    assert len(representatives) == 2
+    assert syndicated == {}
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from benchmark import legacy_extract
+from html_extract import clean_text, extract_article_text
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'html')
+
+# Fixtures not saved as UTF-8
+ENCODINGS = {'windows_1252.html': 'windows-1252'}
+
+# 1 and 3 split every multi-byte character, tag and character reference
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1024, 16 * 1024]
+
+
+def fixture_names():
+    return sorted(name for name in os.listdir(FIXTURES) if name.endswith('.html'))
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def expected_text(name):
+    # Compared after clean_text, as the agent uses it: html.parser itself emits
+    # slightly different whitespace and stray markup depending on chunking
+    encoding = ENCODINGS.get(name, 'utf-8')
+    return clean_text(legacy_extract(read_fixture(name).decode(encoding)))
+
+
+@pytest.mark.parametrize('name', fixture_names())
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_streaming_extractor_matches_beautifulsoup(name, chunk_size):
+    data = read_fixture(name)
+    text = extract_article_text(chunked(data, chunk_size), encoding=ENCODINGS.get(name, 'utf-8'))
+
+    assert clean_text(text) == expected_text(name)
+
+
+@pytest.mark.parametrize('name', fixture_names())
+def test_any_split_into_two_chunks_matches(name):
+    data = read_fixture(name)
+    expected = expected_text(name)
+
+    for split in range(1, len(data)):
+        text = extract_article_text([data[:split], data[split:]], encoding=ENCODINGS.get(name, 'utf-8'))
+        assert clean_text(text) == expected, f"differs when split at byte {split}"
+
+
+def test_extraction_stops_after_first_article():
+    data = read_fixture('nested_articles.html')
+    stats = {}
+    extract_article_text(chunked(data, 16), stats=stats)
+
+    assert stats['bytes'] < len(data)
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from news_fetcher import NewsAPIError, NewsAPIFetcher, RequestBudget
+
+
+class MockNewsAPI:
+    """Local stand-in for /v2/everything answering from a per-request handler.
+
+    ``respond(query, page, attempt)`` returns ``(status, headers, body)``,
+    where ``attempt`` counts earlier requests for the same query and page. A
+    dict body is sent as JSON, anything else as plain text.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                query, page = params['q'][0], int(params['page'][0])
+                with server._lock:
+                    attempt = server.requests.count((query, page))
+                    server.requests.append((query, page))
+                status, headers, body = server.respond(query, page, attempt)
+                if isinstance(body, dict):
+                    body = json.dumps(body)
+                    headers = dict(headers, **{'Content-Type': 'application/json'})
+                body = body.encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/v2/everything"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def page_of(query, page, page_size, total):
+    """A successful response holding the given page of ``total`` results"""
+    first = (page - 1) * page_size
+    return 200, {}, {
+        'status': 'ok',
+        'totalResults': total,
+        'articles': [{'url': f"https://example.com/{query}/{i}", 'title': f"{query} {i}"}
+                     for i in range(first, min(first + page_size, total))]
+    }
+
+
+def fetcher(server, **kwargs):
+    kwargs.setdefault('backoff', 0.01)
+    return NewsAPIFetcher('key', base_url=server.url, **kwargs)
+
+
+def test_pagination_stops_once_total_results_are_fetched():
+    with MockNewsAPI(lambda query, page, attempt: page_of(query, page, 2, 4)) as server:
+        articles = fetcher(server, page_size=2, max_pages=5).fetch(['flood'], {})
+
+    assert [article['url'] for article in articles] == [f"https://example.com/flood/{i}" for i in range(4)]
+    assert server.requests == [('flood', 1), ('flood', 2)]
+
+
+def test_retry_after_is_honoured_up_to_max_retry_delay():
+    def respond(query, page, attempt):
+        if attempt == 0:
+            return 429, {'Retry-After': '30'}, {'status': 'error', 'code': 'rateLimited', 'message': "Slow down"}
+        return page_of(query, page, 10, 3)
+
+    with MockNewsAPI(respond) as server:
+        start = time.monotonic()
+        articles = fetcher(server, page_size=10, max_retry_delay=0.1).fetch(['flood'], {})
+        elapsed = time.monotonic() - start
+
+    assert len(articles) == 3
+    assert server.requests == [('flood', 1), ('flood', 1)]
+    assert 0.1 <= elapsed < 1
+
+
+def test_a_failing_later_page_keeps_the_pages_already_fetched():
+    def respond(query, page, attempt):
+        if page == 2:
+            return 429, {}, {'status': 'error', 'code': 'rateLimited', 'message': "Slow down"}
+        return page_of(query, page, 2, 10)
+
+    with MockNewsAPI(respond) as server:
+        articles = fetcher(server, page_size=2, max_retries=1).fetch(['flood'], {})
+
+    assert [article['url'] for article in articles] == [f"https://example.com/flood/{i}" for i in range(2)]
+    assert server.requests == [('flood', 1), ('flood', 2), ('flood', 2)]
+
+
+def test_budget_exhaustion_returns_what_was_fetched():
+    budget = RequestBudget(2)
+    with MockNewsAPI(lambda query, page, attempt: page_of(query, page, 2, 10)) as server:
+        articles = fetcher(server, page_size=2).fetch(['flood'], {}, budget)
+
+    assert len(articles) == 4
+    assert len(server.requests) == 2
+    assert budget.exhausted
+
+
+def test_one_failing_query_does_not_abort_the_others():
+    def respond(query, page, attempt):
+        if query == 'broken':
+            # A proxy error page rather than NewsAPI's JSON error shape
+            return 503, {}, "<html><body>Service Unavailable</body></html>"
+        return page_of(query, page, 10, 3)
+
+    with MockNewsAPI(respond) as server:
+        articles = fetcher(server, page_size=10, max_retries=1, max_workers=2).fetch(['broken', 'flood'], {})
+
+    assert [article['url'] for article in articles] == [f"https://example.com/flood/{i}" for i in range(3)]
+
+
+def test_every_query_failing_raises():
+    respond = lambda query, page, attempt: (401, {}, {'status': 'error', 'code': 'apiKeyInvalid',
+                                                      'message': "Your API key is invalid"})
+    with MockNewsAPI(respond) as server:
+        with pytest.raises(NewsAPIError, match="API key is invalid"):
+            fetcher(server).fetch(['flood', 'storm'], {})
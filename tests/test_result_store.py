@@ -0,0 +1,49 @@
+from result_store import ResultStore
+from rollups import Rollups
+
+
+def article(i, level='HIGH', sectors=('property',), impact='HIGH'):
+    return {
+        'title': f"Flood losses mount for insurers, part {i}",
+        'source': 'Example News',
+        'url': f"https://example.com/story/{i}",
+        'date': f"2025-03-{i % 28 + 1:02d}T08:00:00Z",
+        'risk_assessment': {'level': level, 'score': 5 + i % 3, 'confidence': 0.8},
+        'affected_sectors': list(sectors),
+        'impact_analysis': {'financial': {'level': impact, 'matches': 3}},
+        'preview': "Severe flooding raised claims across the region",
+        'syndicated_sources': []
+    }
+
+
+def assert_rollups_match_articles(store):
+    expected = Rollups.from_analysis(store.load_analysis())
+    assert vars(store.rollups()) == vars(expected)
+
+
+def test_rescored_articles_move_between_rollup_counters(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    first = [article(i) for i in range(4)]
+    assert store.append(first) == 4
+    assert_rollups_match_articles(store)
+
+    # Two articles are rescored into another level, sector set and impact level
+    rescored = [article(i, level='LOW', sectors=('health', 'life'), impact='LOW') for i in (1, 3)]
+    assert store.append(rescored) == 2
+    assert_rollups_match_articles(store)
+
+    rollups = store.rollups()
+    assert rollups.total == 4
+    assert rollups.risk_levels == {'HIGH': 2, 'LOW': 2}
+    assert rollups.sectors == {'property': 2, 'health': 2, 'life': 2}
+    assert store.count(sector='property') == 2
+    assert store.count(sector=['health', 'property']) == 4
+    assert store.count(risk_level='LOW', sector='life') == 2
+
+
+def test_load_analysis_round_trips_appended_articles(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    articles = [article(0), article(1, level='MEDIUM'), article(2)]
+    store.append(articles)
+
+    assert store.load_analysis() == {'HIGH': [articles[0], articles[2]], 'MEDIUM': [articles[1]]}
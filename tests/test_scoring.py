@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from batch_scoring import BatchScorer
+from insurance_climate_agent import InsuranceClimateAgent
+from parse_pool import parse_and_score
+from taxonomy import DEFAULT_TAXONOMY_FILE, load_taxonomy
+
+TEXTS = [
+    "The wildfire and covid outbreak strained hospitals and crop insurers",
+    "Severe FLOODING: insurers expect record claims this season, losses above $1 billion",
+    "Reinsurance renewals tighten after hurricane losses; regulators review capital rules",
+    "Nothing relevant here at all",
+    "",
+]
+
+
+@pytest.fixture
+def mixed_case_taxonomy(tmp_path):
+    with open(DEFAULT_TAXONOMY_FILE) as f:
+        taxonomy = json.load(f)
+    taxonomy['version'] = 'mixed-case'
+    taxonomy['insurance_sectors']['Health'] = taxonomy['insurance_sectors'].get('Health', []) + ['COVID']
+    taxonomy['risk_indicators']['HIGH']['keywords'].append('Wildfire')
+    taxonomy['impact_areas']['Operational'].append('Outbreak')
+    path = tmp_path / 'taxonomy.json'
+    path.write_text(json.dumps(taxonomy))
+    return str(path)
+
+
+def test_keywords_are_lowercased(mixed_case_taxonomy):
+    taxonomy = load_taxonomy(mixed_case_taxonomy)
+
+    assert 'covid' in taxonomy['insurance_sectors']['Health']
+    assert 'wildfire' in taxonomy['risk_indicators']['HIGH']['keywords']
+    assert 'outbreak' in taxonomy['impact_areas']['Operational']
+
+
+@pytest.mark.parametrize('taxonomy_file', [None, 'mixed'])
+def test_live_batch_and_parse_pool_scoring_agree(taxonomy_file, mixed_case_taxonomy):
+    agent = InsuranceClimateAgent(taxonomy_file=mixed_case_taxonomy if taxonomy_file else None,
+                                  parse_processes=1)
+    expected = [agent.score_content(text) for text in TEXTS]
+
+    assert agent.analyze_batch(TEXTS) == expected
+    assert BatchScorer(agent.taxonomy).score(TEXTS) == expected
+    # Scored in a worker process set up by parse_pool.init_worker with the agent's taxonomy
+    try:
+        pooled = [agent.parse_pool.submit(parse_and_score, text).result() for text in TEXTS]
+    finally:
+        agent.close()
+    assert [scores for _, scores in pooled] == expected
+
+
+def test_parse_pool_extracts_page_bytes_before_scoring():
+    agent = InsuranceClimateAgent(parse_processes=1)
+    page = f"<html><body><article><p>{TEXTS[1]}</p></article></body></html>".encode('utf-8')
+    try:
+        text, scores = agent.parse_pool.submit(parse_and_score, "Storm update", page).result()
+    finally:
+        agent.close()
+
+    assert text == agent.clean_text(TEXTS[1])
+    assert scores == agent.score_content(agent.scoring_text({'content': "Storm update"}, text))
+
+
+def test_mixed_case_keywords_match(mixed_case_taxonomy):
+    agent = InsuranceClimateAgent(taxonomy_file=mixed_case_taxonomy)
+    result = agent.score_content(TEXTS[0])
+
+    assert 'Health' in result['affected_sectors']
+    assert result['risk_assessment']['level'] == 'HIGH'
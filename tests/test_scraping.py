@@ -0,0 +1,223 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from domain_stats import DomainStats
+from insurance_climate_agent import InsuranceClimateAgent
+
+
+class DelayedPageServer:
+    """Local publisher serving /articles/<n> after a delay, tracking concurrent requests.
+
+    ``/v2/everything`` lists the articles in a NewsAPI-shaped payload, so the
+    server can also stand in for the search API.
+    """
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path == '/v2/everything':
+                    body = json.dumps(server.news_payload()).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    index = int(path.rsplit('/', 1)[1])
+                    with server._lock:
+                        server.active += 1
+                        server.max_active = max(server.max_active, server.active)
+                    try:
+                        time.sleep(server.delays[index])
+                    finally:
+                        with server._lock:
+                            server.active -= 1
+                    # Long enough to count as article text for the publisher's statistics
+                    paragraph = "<p>Insurers expect flood claims to rise across the region.</p>" * 5
+                    body = (f"<html><body><article><p>Page {index} on flood insurance claims</p>"
+                            f"{paragraph}</article></body></html>").encode('utf-8')
+                    content_type = 'text/html; charset=utf-8'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def url(self, index):
+        return f"{self.base_url}/articles/{index}"
+
+    def news_payload(self):
+        return {
+            'status': 'ok',
+            'totalResults': len(self.delays),
+            'articles': [{
+                'source': {'id': None, 'name': 'Local'},
+                'title': f"Story {i}",
+                'description': "Insurers assess losses after the storm",
+                'url': self.url(i),
+                'publishedAt': f"2025-03-01T{i % 24:02d}:00:00Z",
+                'content': "Severe flooding raised claims across the region"
+            } for i in range(len(self.delays))]
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def scrape_all(agent, urls):
+    return {index: content for index, content in agent.iter_scraped(urls)}
+
+
+def test_iter_scraped_yields_each_page_once_under_its_index():
+    with DelayedPageServer([0.02] * 6) as a, DelayedPageServer([0.01] * 6) as b:
+        urls = [server.url(i) for i in range(6) for server in (a, b)]
+        contents = scrape_all(InsuranceClimateAgent(max_workers=4, per_host_limit=2), urls)
+
+    assert sorted(contents) == list(range(len(urls)))
+    for index, url in enumerate(urls):
+        assert f"Page {url.rsplit('/', 1)[1]} on flood" in contents[index]
+
+
+def test_per_host_limit_caps_concurrent_requests():
+    with DelayedPageServer([0.05] * 12) as a, DelayedPageServer([0.05] * 12) as b:
+        urls = [a.url(i) for i in range(12)] + [b.url(i) for i in range(12)]
+        scrape_all(InsuranceClimateAgent(max_workers=8, per_host_limit=2), urls)
+
+    assert a.max_active == 2
+    assert b.max_active == 2
+
+
+def test_saturated_host_does_not_park_threads_other_hosts_could_use():
+    # 16 pages of one host queued ahead of 16 of another: both hosts should be
+    # served side by side, in about 16 / 2 * 0.1s, not one after the other
+    with DelayedPageServer([0.1] * 16) as a, DelayedPageServer([0.1] * 16) as b:
+        urls = [a.url(i) for i in range(16)] + [b.url(i) for i in range(16)]
+        agent = InsuranceClimateAgent(max_workers=8, per_host_limit=2)
+        start = time.monotonic()
+        contents = scrape_all(agent, urls)
+        elapsed = time.monotonic() - start
+
+    assert all(contents.values())
+    assert b.max_active == 2
+    assert elapsed < 1.5
+
+
+def test_deadline_yields_unfinished_pages_empty():
+    with DelayedPageServer([0.2] * 10) as a:
+        agent = InsuranceClimateAgent(max_workers=4, per_host_limit=1, scrape_deadline=0.5)
+        start = time.monotonic()
+        contents = scrape_all(agent, [a.url(i) for i in range(10)])
+        elapsed = time.monotonic() - start
+
+    assert sorted(contents) == list(range(10))
+    assert 1 <= sum(1 for content in contents.values() if content) < 10
+    assert elapsed < 1.0
+
+
+def test_timeouts_cut_short_by_the_deadline_leave_host_stats_alone():
+    with DelayedPageServer([0.6] * 3) as a:
+        agent = InsuranceClimateAgent(max_workers=2, per_host_limit=2, scrape_deadline=0.3)
+        contents = scrape_all(agent, [a.url(i) for i in range(3)])
+        # Let the abandoned requests time out and be recorded
+        time.sleep(0.5)
+
+    assert not any(contents.values())
+    assert agent.domain_stats.summary() == {}
+
+
+def test_a_circuit_trial_cut_short_by_the_deadline_is_rearmed():
+    with DelayedPageServer([0.6] * 2) as a:
+        agent = InsuranceClimateAgent(max_workers=1, per_host_limit=1, scrape_deadline=0.3)
+        host = a.base_url.split('//', 1)[1]
+        for _ in range(agent.domain_stats.failure_threshold):
+            agent.domain_stats.record(host, 1.0, failed=True)
+        # The cooldown is over: the next request is the trial
+        agent.domain_stats._hosts[host]['open_until'] = 0.0
+        scrape_all(agent, [a.url(0)])
+
+    # The trial's result was dropped, so the next request may try the host again
+    assert agent.domain_stats.skip_reason(host) is None
+    assert agent.domain_stats.skip_reason(host) == 'circuit_open'
+
+
+def test_rearm_lets_the_next_request_probe_a_skipped_host():
+    stats = DomainStats(min_samples=2)
+    for _ in range(2):
+        stats.record('example.com', 0.1, chars=0)
+
+    assert stats.skip_reason('example.com') is None
+    assert stats.skip_reason('example.com') == 'no_text'
+    stats.rearm('example.com')
+    assert stats.skip_reason('example.com') is None
+
+
+@pytest.mark.parametrize('parse_processes', [0, 2])
+def test_ordered_run_yields_articles_in_newsapi_order(parse_processes):
+    # Later pages finish first, so completion order is the reverse of NewsAPI order
+    with DelayedPageServer([0.3 - 0.03 * i for i in range(8)]) as server:
+        agent = InsuranceClimateAgent(max_workers=8, per_host_limit=8, dedup_distance=None,
+                                      news_api_url=f"{server.base_url}/v2/everything",
+                                      parse_processes=parse_processes)
+        try:
+            articles = list(agent.iter_insurance_climate_news(ordered=True))
+        finally:
+            agent.close()
+
+    assert [article['url'] for article in articles] == [server.url(i) for i in range(8)]
+
+
+def test_parse_pool_is_replaced_after_a_worker_dies():
+    with DelayedPageServer([0.01] * 4) as server:
+        agent = InsuranceClimateAgent(max_workers=4, per_host_limit=4, dedup_distance=None,
+                                      news_api_url=f"{server.base_url}/v2/everything", parse_processes=2)
+        try:
+            assert len(list(agent.iter_insurance_climate_news())) == 4
+            broken = agent.parse_pool
+            next(iter(broken._processes.values())).kill()
+
+            articles = list(agent.iter_insurance_climate_news(ordered=True))
+            assert agent.parse_pool is not broken
+        finally:
+            agent.close()
+
+    assert [article['url'] for article in articles] == [server.url(i) for i in range(4)]
+    assert all(host['success_rate'] == 1.0 for host in agent.domain_stats.summary().values())
+
+
+def test_pages_are_parsed_in_threads_when_the_pool_breaks_mid_run():
+    with DelayedPageServer([0.3] * 4) as server:
+        agent = InsuranceClimateAgent(max_workers=4, per_host_limit=4, dedup_distance=None,
+                                      news_api_url=f"{server.base_url}/v2/everything", parse_processes=2)
+        try:
+            pool = agent.parse_pool
+            # Killed while the pages are still downloading
+            threading.Timer(0.15, lambda: next(iter(pool._processes.values())).kill()).start()
+            articles = list(agent.iter_insurance_climate_news(ordered=True))
+        finally:
+            agent.close()
+
+    assert [article['url'] for article in articles] == [server.url(i) for i in range(4)]
+    assert all("flood insurance claims" in article['preview'] for article in articles)
+    assert all(host['success_rate'] == 1.0 for host in agent.domain_stats.summary().values())
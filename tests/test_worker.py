@@ -0,0 +1,35 @@
+import threading
+
+from worker import IngestWorker
+
+
+class FailingAgent:
+    """Agent stand-in whose runs find nothing and whose saves always fail"""
+
+    taxonomy_version = 'test'
+
+    def __init__(self):
+        self.last_run_articles = []
+        self.last_run_texts = {}
+        self.saves = 0
+
+    def get_insurance_climate_news(self, **kwargs):
+        return {}
+
+    def save_analysis(self, analysis, filename):
+        self.saves += 1
+        return False
+
+
+def test_failed_runs_count_towards_max_runs(tmp_path):
+    agent = FailingAgent()
+    worker = IngestWorker(output=str(tmp_path / 'analysis.json'), interval=0.01, agent=agent)
+    thread = threading.Thread(target=worker.run_forever, kwargs={'max_runs': 1}, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    worker.stop()
+
+    assert not thread.is_alive()
+    assert agent.saves == 1
+    assert worker.runs == 1
+    assert worker.last_run_ok is False
@@ -0,0 +1,151 @@
+import argparse
+import logging
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# The agent and its dependencies (requests, the HTML parser, the keyword
+# automaton, SQLite) are imported when a worker is built, not at module load,
+# so argument errors and --help return immediately.
+
+
+class IngestWorker:
+    """Headless ingestion loop around one long-lived agent.
+
+    The agent, its pooled HTTP session, keyword automaton and scrape cache
+    stay warm between runs. Each run is incremental and is published
+    atomically: the run's articles are appended to the result store in one
+    transaction, and only then are the JSON corpus and ingest state replaced
+    by rename.
+    Runs start every ``interval`` seconds, shifted by up to ``jitter`` of the
+    interval so several workers do not hit NewsAPI at the same moment.
+    """
+
+    def __init__(self, output: str = "insurance_climate_analysis.json", store_path: Optional[str] = None,
+                 interval: float = 30 * 60, jitter: float = 0.1, agent=None, metrics=None,
+                 metrics_file: Optional[str] = None, **agent_options):
+        from instrumentation import NullMetrics
+        from insurance_climate_agent import InsuranceClimateAgent
+
+        self.output = output
+        self.interval = interval
+        self.jitter = jitter
+        self.metrics = metrics or NullMetrics()
+        self.metrics_file = metrics_file
+        self.agent = agent or InsuranceClimateAgent(metrics=self.metrics, **agent_options)
+
+        self.store = None
+        if store_path:
+            from result_store import ResultStore
+            self.store = ResultStore(store_path)
+
+        # Attempted runs, successful or not, and whether the latest one succeeded
+        self.runs = 0
+        self.last_run_ok: Optional[bool] = None
+        self._stop = threading.Event()
+
+    def next_delay(self) -> float:
+        """Seconds from the start of one run to the start of the next"""
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def run_once(self) -> int:
+        """Run one incremental ingestion and publish it, returning the number of articles written"""
+        with self.metrics.timer('worker_run_seconds'):
+            analysis = self.agent.get_insurance_climate_news(incremental=True, corpus_file=self.output,
+                                                             report=False)
+            # The store is written first: saving the corpus also saves the ingest state,
+            # and URLs it marks as processed are never fetched again. Appends upsert by
+            # URL, so a run whose save fails is simply stored again by the next run.
+            written = len(self.agent.last_run_articles)
+            if self.store:
+                written = self.store.append(self.agent.last_run_articles, self.agent.last_run_texts,
+                                            self.agent.taxonomy_version)
+                logger.info("%d articles stored in %s", written, self.store.path)
+
+            if not self.agent.save_analysis(analysis, self.output):
+                raise RuntimeError(f"Could not save analysis to {self.output}")
+        return written
+
+    def run_forever(self, max_runs: Optional[int] = None):
+        """Run on schedule until stop() is called or max_runs runs, failed ones included, have finished"""
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+                self.last_run_ok = True
+                self.metrics.inc('worker_runs_total', result='ok')
+            except Exception as e:
+                logger.exception("Ingestion run failed: %s", e)
+                self.last_run_ok = False
+                self.metrics.inc('worker_runs_total', result='error')
+            self.runs += 1
+            if self.metrics_file:
+                self.metrics.write_prometheus(self.metrics_file)
+            if max_runs is not None and self.runs >= max_runs:
+                break
+
+            delay = max(0.0, self.next_delay() - (time.monotonic() - started))
+            logger.info("Next ingestion run in %.0f seconds", delay)
+            self._stop.wait(delay)
+
+    def stop(self):
+        """Ask the loop to exit after the current run"""
+        self._stop.set()
+
+
+def main():
+    # Settings such as RESULT_STORE may come from .env, so load it before reading defaults
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run insurance climate ingestion on a schedule")
+    parser.add_argument('--interval', type=float, default=float(os.getenv('INGEST_INTERVAL', 30 * 60)),
+                        help="seconds between run starts (default: INGEST_INTERVAL or 1800)")
+    parser.add_argument('--jitter', type=float, default=0.1,
+                        help="fraction of the interval each start may shift by")
+    parser.add_argument('--once', action='store_true', help="run a single ingestion and exit")
+    parser.add_argument('--output', default="insurance_climate_analysis.json",
+                        help="analysis JSON file to update")
+    parser.add_argument('--store', default=os.getenv('RESULT_STORE'),
+                        help="SQLite result store the dashboard reads")
+    parser.add_argument('--query', action='append', dest='queries',
+                        help="NewsAPI query to run; repeat to search several variants")
+    parser.add_argument('--json-logs', action='store_true',
+                        help="log structured JSON lines instead of plain messages")
+    parser.add_argument('--metrics-file', default=os.getenv('METRICS_FILE'),
+                        help="rewrite Prometheus metrics to this file after every run")
+    parser.add_argument('--metrics-port', type=int,
+                        help="serve Prometheus metrics on this port at /metrics")
+    parser.add_argument('--parse-processes', type=int, default=int(os.getenv('PARSE_PROCESSES', 0)),
+                        help="processes that extract and score pages while threads download them "
+                             "(default: PARSE_PROCESSES or 0, parse in the scraper threads)")
+    args = parser.parse_args()
+
+    from instrumentation import Metrics, NullMetrics, configure_logging
+
+    configure_logging(json_logs=args.json_logs)
+    metrics = Metrics() if args.json_logs or args.metrics_file or args.metrics_port else NullMetrics()
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    worker = IngestWorker(output=args.output, store_path=args.store, interval=args.interval,
+                          jitter=args.jitter, metrics=metrics, metrics_file=args.metrics_file,
+                          cache_dir=os.getenv('SCRAPE_CACHE_DIR'), queries=args.queries,
+                          parse_processes=args.parse_processes)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop())
+    try:
+        worker.run_forever(max_runs=1 if args.once else None)
+    finally:
+        worker.agent.close()
+    if args.once and not worker.last_run_ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()